@@ -34,7 +34,7 @@
 
 import os
 import sys
-import glob
+import time
 import datetime
 import logging
 import functools
@@ -42,19 +42,209 @@ import importlib
 import platform
 import subprocess
 import collections
+import types
 import shutil
+import re
 #  import order seems to matter on linux. QtCore and QtSql (in metadata_db)
 #  have to be imported before (I think) cv2. If not you get a weird error
 #  loading a shared library when importing them.
 from PyQt5 import QtCore
 from pathlib import Path
 from metadata_db import metadata_db
-import google.protobuf
-import yaml
-import numpy as np
-import cv2
-from SerialMonitor import SerialMonitor
-from CamtrawlServer import CamtrawlServer
+import DiskMonitor
+import DatabaseWriter
+
+#  use the Rust based fastyaml-rs parser if it is available. It is API compatible
+#  with PyYAML's safe_load but is considerably faster.
+#  If it isn't, use PyYAML with the libyaml based CSafeLoader if PyYAML was built
+#  with libyaml support and fall back to the pure Python SafeLoader if not.
+_YAML_C_LOADER_MISSING = False
+_YAML_NEEDS_BOOL_FIXUP = False
+try:
+    import fastyaml_rs as yaml
+    _yaml_safe_load = yaml.safe_load
+    _YAML_NEEDS_BOOL_FIXUP = True
+except ImportError:
+    import yaml
+    try:
+        _YamlLoader = yaml.CSafeLoader
+    except AttributeError:
+        _YamlLoader = yaml.SafeLoader
+        _YAML_C_LOADER_MISSING = True
+    _yaml_safe_load = functools.partial(yaml.load, Loader=_YamlLoader)
+YAMLError = getattr(yaml, 'YAMLError', ValueError)
+
+#  fastyaml-rs implements YAML 1.2 which does not treat yes/no/on/off as booleans.
+#  When it is used, this table converts these strings to bools when the default
+#  value for a parameter is a bool to match the YAML 1.1 behavior of PyYAML.
+_YAML11_BOOLS = {'yes':True, 'no':False, 'on':True, 'off':False,
+                 'true':True, 'false':False}
+
+#  bind the Mapping ABC used when walking the nested configuration dicts and
+#  create a sentinel used to mark missing keys.
+_Mapping = collections.abc.Mapping
+_MISSING = object()
+
+#  bind the clock function called for every synced sensor datagram
+_monotonic = time.monotonic
+
+#  TriggerEvent is the payload of the trigger signal. The fields are in the same
+#  order as the camera driver trigger() arguments so an event can be unpacked
+#  directly into a trigger call.
+TriggerEvent = collections.namedtuple('TriggerEvent',
+        'cam_list image_number timestamp save_image emit_signal')
+
+#  numpy, cv2, and protobuf are large extension modules that are not needed until
+#  the application is actually set up. They are imported by _lazy_imports() which
+#  is called from AcquisitionSetup. Deferring them keeps things like --help and
+#  config checks quick and ensures they are always loaded after QtCore/QtSql.
+np = None
+cv2 = None
+protobuf = None
+
+
+def _lazy_imports():
+    '''_lazy_imports imports the deferred modules into this module's global
+    namespace. It is safe to call more than once.
+    '''
+    this_module = sys.modules[__name__]
+    for attr_name, module_name in (('np', 'numpy'), ('cv2', 'cv2'),
+            ('protobuf', 'google.protobuf')):
+        if getattr(this_module, attr_name) is None:
+            setattr(this_module, attr_name, importlib.import_module(module_name))
+
+
+def _count_files_capped(root, cap):
+    '''_count_files_capped returns the number of files in the directory tree rooted
+    at root. Counting stops once cap is exceeded and cap + 1 is returned so large
+    trees are not walked in their entirety.
+    '''
+    n_files = 0
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    n_files += 1
+                    if n_files > cap:
+                        return cap + 1
+    return n_files
+
+
+def _copy_file(src, dst):
+    '''_copy_file copies the contents of the file src to dst. os.copy_file_range is
+    used where it is available so the data is copied by the kernel (or reflinked on
+    file systems that support it) without passing through Python buffers. If that
+    isn't available or fails, the remainder of the file is copied with copyfileobj.
+    '''
+    with open(src, 'rb', buffering=0) as fsrc, open(dst, 'wb', buffering=0) as fdst:
+        if hasattr(os, 'copy_file_range'):
+            try:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    n_copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if n_copied == 0:
+                        break
+                    remaining -= n_copied
+            except OSError:
+                #  not supported for these files (cross device on older kernels, etc.)
+                pass
+        #  copy whatever is left from the current file offsets
+        shutil.copyfileobj(fsrc, fdst, length=1024 * 1024)
+
+
+def _fast_copytree(src, dst):
+    '''_fast_copytree recursively copies the directory tree src to dst using _copy_file.
+    Like shutil.copytree, dst must not exist and file and directory metadata is copied
+    along with the data.
+    '''
+    os.makedirs(dst)
+    stack = [(src, dst)]
+    while stack:
+        src_dir, dst_dir = stack.pop()
+        with os.scandir(src_dir) as entries:
+            for entry in entries:
+                dst_path = os.path.join(dst_dir, entry.name)
+                if entry.is_dir():
+                    os.mkdir(dst_path)
+                    stack.append((entry.path, dst_path))
+                else:
+                    _copy_file(entry.path, dst_path)
+                    shutil.copystat(entry.path, dst_path)
+        shutil.copystat(src_dir, dst_dir)
+
+
+def _flatten(d):
+    '''_flatten converts a nested dict into a flat dict keyed by key path tuples.
+    Only dicts are descended into so list values are preserved as leaves. Empty
+    dicts are also kept as leaves so they survive the round trip through _unflatten.
+    Tuples are used for the key paths since config keys (camera names, etc.) can
+    contain any character we might pick as a separator.
+    '''
+    flat = {}
+    if not d:
+        return flat
+    queue = collections.deque([((), d)])
+    while queue:
+        prefix, mapping = queue.popleft()
+        for k, v in mapping.items():
+            path = prefix + (k,)
+            if isinstance(v, _Mapping) and len(v) > 0:
+                queue.append((path, v))
+            elif isinstance(v, _Mapping):
+                flat[path] = {}
+            else:
+                flat[path] = v
+    return flat
+
+
+def _unflatten(flat):
+    '''_unflatten reconstructs a nested dict from a dict created by _flatten.
+    '''
+    d = {}
+    for path, v in flat.items():
+        node = d
+        for k in path[:-1]:
+            child = node.get(k)
+            if not isinstance(child, dict):
+                #  missing or a leaf that has been replaced by a mapping
+                child = node[k] = {}
+            node = child
+        if isinstance(v, dict) and isinstance(node.get(path[-1]), dict):
+            #  this is an empty dict leaf and the path already has values
+            continue
+        node[path[-1]] = v
+    return d
+
+
+class _SetupTaskSignals(QtCore.QObject):
+    '''_SetupTaskSignals provides the signals for _SetupTask since QRunnable
+    is not a QObject.
+    '''
+    finished = QtCore.pyqtSignal()
+
+
+class _SetupTask(QtCore.QRunnable):
+    '''_SetupTask wraps a callable so it can be run in a QThreadPool. The
+    finished signal is emitted when the callable returns. Exceptions raised by
+    the callable are logged since an exception escaping run aborts the application.
+    '''
+
+    def __init__(self, func):
+        super(_SetupTask, self).__init__()
+        self.func = func
+        self.signals = _SetupTaskSignals()
+
+
+    def run(self):
+        try:
+            self.func()
+        except Exception:
+            logging.getLogger('Acquisition').exception('Error running setup task %s', self.func)
+        finally:
+            self.signals.finished.emit()
 
 
 class AcquisitionBase(QtCore.QObject):
@@ -63,8 +253,9 @@ class AcquisitionBase(QtCore.QObject):
     VERSION = '4.4'
 
     # CAMERA_CONFIG_OPTIONS defines the default camera configuration options.
-    # These values are used if not specified in the configuration file.
-    CAMERA_CONFIG_OPTIONS = {'exposure_us':4000,
+    # These values are used if not specified in the configuration file. It is
+    # read only, GetCameraConfiguration copies it before applying a camera's settings.
+    CAMERA_CONFIG_OPTIONS = types.MappingProxyType({'exposure_us':4000,
                              'gain':18,
                              'driver': 'SpinCamera',
                              'label':'Camera',
@@ -92,7 +283,11 @@ class AcquisitionBase(QtCore.QObject):
                              'video_preset': 'default',
                              'video_force_framerate': -1,
                              'video_frame_divider': 1,
-                             'video_scale': 100}
+                             'video_scale': 100})
+
+    #  CameraCfg is an immutable record of a camera's merged configuration. These are
+    #  stored by camera name in the camera_params dict when the cameras are configured.
+    CameraCfg = collections.namedtuple('CameraCfg', sorted(CAMERA_CONFIG_OPTIONS))
 
     #  DEFAULT_VIDEO_PROFILE defines the default options for the 'default' video profile.
     DEFAULT_VIDEO_PROFILE = {'encoder':'libx265',
@@ -108,6 +303,33 @@ class AcquisitionBase(QtCore.QObject):
     #  ignored. Driver names should be entered in lower case.
     VALID_DRIVERS = ['spincamera', 'cv2videocamera']
 
+    #  _CAMERA_FACTORIES maps the (lower case) driver names to the names of the methods
+    #  that create camera objects using that driver. The methods are looked up by name
+    #  so subclasses can override them.
+    _CAMERA_FACTORIES = {'spincamera': '_MakeSpinCamera',
+                         'cv2videocamera': '_MakeCV2Camera'}
+
+    #  _CAMERA_GET_METHODS and _CAMERA_SET_METHODS map the (lower case) camera parameter
+    #  names to the names of the camera methods used to get and set them.
+    _CAMERA_GET_METHODS = {'gain': 'get_gain', 'exposure': 'get_exposure'}
+    _CAMERA_SET_METHODS = {'gain': ('set_gain', 'get_gain'),
+                           'exposure': ('set_exposure', 'get_exposure')}
+
+    #  _SYNC_ALIASES contains the (lower case) sensor type strings that mark a sensor
+    #  as synchronous. Any other type string is treated as asynchronous.
+    _SYNC_ALIASES = frozenset({'synchronous', 'syncd', 'sync', 'synced'})
+
+    #  _TRUE_STRINGS contains the (lower case) strings accepted as True in
+    #  parameter values sent by the server.
+    _TRUE_STRINGS = frozenset({'yes', 'true', '1', 't'})
+
+    #  _JPEG_EXTENSIONS contains the (lower case) still image file extensions
+    #  that are written as JPEG files.
+    _JPEG_EXTENSIONS = frozenset({'.jpeg', '.jpg'})
+
+    #  _IMAGE_NUMBER_RE matches the image number at the start of an image file name.
+    _IMAGE_NUMBER_RE = re.compile(r'^(\d+)_')
+
     #  specify the maximum number of times the application will attempt to open a
     #  metadata db file when running in combined mode and the original db file
     #  cannot be opened.
@@ -117,9 +339,34 @@ class AcquisitionBase(QtCore.QObject):
     #  This should be at a minimum 2x your exposure + data transfer time.
     ACQUISITION_TIMEOUT = 1000
 
-    #  specify how many times we will timeout waiting for threads to finish when
-    #  shutting down the application.
-    TEARDOWN_TRIES = 12
+    #  the trigger timer phases. When the timer expires in the trigger phase the cameras
+    #  are triggered. When it expires in the timeout phase, the cameras failed to respond
+    #  to the last trigger within ACQUISITION_TIMEOUT.
+    TRIGGER_PHASE = 0
+    TIMEOUT_PHASE = 1
+
+    #  specify how long to wait (in ms) for the serial and server threads to finish
+    #  when shutting down the application before continuing without them.
+    TEARDOWN_TIMEOUT_MS = 6000
+
+    #  specify the window (in ms) over which parameter changes made by SetParameterRequest
+    #  are collected before being emitted. Repeated changes to the same parameter within
+    #  the window are coalesced and only the most recent value is emitted.
+    PARAM_COALESCE_MS = 16
+
+    #  specify how often (in ms) buffered async sensor data are written to the database
+    #  and the number of buffered rows that will trigger an immediate write.
+    ASYNC_FLUSH_MS = 200
+    ASYNC_FLUSH_ROWS = 100
+
+    #  the actions SensorDataAvailable takes for a sensor's data
+    SENSOR_NOT_LOGGED = 0
+    SENSOR_IGNORE = 1
+    SENSOR_SYNC = 2
+    SENSOR_ASYNC = 3
+
+    #  specify the maximum number of sensor/header actions cached by _GetSensorAction
+    MAX_SENSOR_ACTIONS = 1000
 
     #  specify the maximum number of files allowed in the calibration folder. If
     #  more files exist, the copy is skipped. The calibration folder should only have
@@ -131,8 +378,11 @@ class AcquisitionBase(QtCore.QObject):
     sensorData = QtCore.pyqtSignal(str, str, datetime.datetime, str)
     stopAcquiring = QtCore.pyqtSignal(list)
     startAcquiring = QtCore.pyqtSignal((list, str, bool, dict, bool, dict))
-    trigger = QtCore.pyqtSignal(list, int, datetime.datetime, bool, bool)
+    trigger = QtCore.pyqtSignal(object)
     stopServer = QtCore.pyqtSignal()
+    stopDiskMonitor = QtCore.pyqtSignal()
+    dbWrite = QtCore.pyqtSignal(str, object)
+    stopDbWriter = QtCore.pyqtSignal()
     parameterChanged = QtCore.pyqtSignal(str, str, str, bool, str)
     stopApp = QtCore.pyqtSignal(bool)
 
@@ -160,95 +410,144 @@ class AcquisitionBase(QtCore.QObject):
         self.serverThread = None
         self.server = None
         self.spin_system = None
-        self.diskStatTimer = None
+        self.diskMonitor = None
+        self.diskMonitorThread = None
+        self.dbWriter = None
+        self.dbWriterThread = None
         self.spin_cameras = {}
         self.cameras = {}
+        self._camera_names = ()
+        #  the directory containing this script. Relative paths in the config are relative to it.
+        self._script_dir = os.path.dirname(os.path.realpath(__file__))
+        self.camera_params = {}
+        self.default_camera_config = None
         self.threads = []
 
         self.hw_triggered_cameras = []
         self.sync_trigger_messages = []
+        self._pending_images = []
         self.received = {}
+        self._pending_cameras = 0
         self.use_db = True
+        #  the log handlers are added in AcquisitionSetup. Until then messages at
+        #  WARNING and above are written to stderr by the logging module.
+        self.logger = logging.getLogger('Acquisition')
+        self.triggers_since_commit = 0
+        self._trigger_deadline_ns = 0
         self.syncdSensorData = {}
+        self._sensor_headers = {}
+        self._installed_sensors = {}
+        self._is_sync_by_header = {}
+        self._sensor_actions = {}
         self.readyToTrigger = {}
-        self.acqisition_teardown_tries = 0
         self.serial_threads_finished = False
         self.server_finished = False
+        self.db_writer_stopped = False
+        self.db_writer_finished = True
+        self.teardownTimer = None
         self.saved_last_still = False
         self.saved_last_frame = False
         self.n_saved_frames = 0
         self.n_saved_stills = 0
+        self.setup_tasks = []
+        self.setup_tasks_pending = 0
 
         #  create the default configuration dict. These values are used for application
         #  configuration if they are not provided in the config file.
-        self.configuration = {}
-        self.configuration['metadata'] = {}
-        self.configuration['application'] = {}
-        self.configuration['acquisition'] = {}
-        self.configuration['cameras'] = {}
-        self.configuration['server'] = {}
-        self.configuration['sensors'] = {}
-
-        self.configuration['application']['output_mode'] = 'separate'
-        self.configuration['application']['output_path'] = './data'
-        self.configuration['application']['calibration_path'] = './calibration'
-        self.configuration['application']['log_level'] = 'INFO'
-        self.configuration['application']['database_name'] = 'CamtrawlMetadata.db3'
-        self.configuration['application']['shut_down_on_exit'] = False
-        self.configuration['application']['always_trigger_at_start'] = False
-        self.configuration['application']['ffmpeg_path'] = ''
-        self.configuration['application']['disk_free_monitor'] = True
-        self.configuration['application']['disk_free_min_mb'] = 150
-        self.configuration['application']['disk_free_check_int_ms'] = 5000
-
-        self.configuration['acquisition']['trigger_rate'] = 5
-        self.configuration['acquisition']['trigger_limit'] = -1
-        self.configuration['acquisition']['video_log_frames'] = False
-        self.configuration['acquisition']['video_sync_data_divider'] = 15
-        self.configuration['acquisition']['still_sync_data_divider'] = 1
-
-        self.configuration['server']['start_server'] = False
-        self.configuration['server']['server_port'] = 7889
-        self.configuration['server']['server_interface'] = '0.0.0.0'
-
-        self.configuration['sensors']['default_type'] = 'synchronous'
-        self.configuration['sensors']['synchronous'] = []
-        self.configuration['sensors']['asynchronous'] = []
-        self.configuration['sensors']['synchronous_timeout_secs'] = 5
-        self.configuration['sensors']['installed_sensors'] = {}
-
-        self.configuration['metadata']['vessel_name'] = ''
-        self.configuration['metadata']['survey_name'] = ''
-        self.configuration['metadata']['camera_name'] = 'Camtrawl'
-        self.configuration['metadata']['survey_description'] = ''
+        self.configuration = {
+            'metadata': {'vessel_name':'',
+                         'survey_name':'',
+                         'camera_name':'Camtrawl',
+                         'survey_description':''},
+            'application': {'output_mode':'separate',
+                            'output_path':'./data',
+                            'calibration_path':'./calibration',
+                            'log_level':'INFO',
+                            'database_name':'CamtrawlMetadata.db3',
+                            'shut_down_on_exit':False,
+                            'always_trigger_at_start':False,
+                            'ffmpeg_path':'',
+                            'disk_free_monitor':True,
+                            'disk_free_min_mb':150,
+                            'disk_free_check_int_ms':5000,
+                            'commit_every_n_triggers':1},
+            'acquisition': {'trigger_rate':5,
+                            'trigger_limit':-1,
+                            'video_log_frames':False,
+                            'video_sync_data_divider':15,
+                            'still_sync_data_divider':1},
+            'cameras': {},
+            'server': {'start_server':False,
+                       'server_port':7889,
+                       'server_interface':'0.0.0.0'},
+            'sensors': {'default_type':'synchronous',
+                        'synchronous':[],
+                        'asynchronous':[],
+                        'synchronous_timeout_secs':5,
+                        'installed_sensors':{}}}
 
         #  Create an instance of metadata_db which is a simple interface to the
         #  camtrawl metadata database
         self.db = metadata_db()
 
         #  Create a SerialMonitor instance which will manage serial sensor data.
+        from SerialMonitor import SerialMonitor
         self.serialSensors = SerialMonitor.SerialMonitor(self)
         self.serialSensors.SerialDataReceived.connect(self.SerialDataReceived)
         self.serialSensors.SerialDevicesStopped.connect(self.SerialDevicesStopped)
         self.serialSensors.SerialError.connect(self.SerialDeviceError)
 
-        #  create the trigger timer
+        #  create the trigger timer. This timer is used both to schedule the next
+        #  trigger and as the trigger timeout timer once the cameras have been
+        #  triggered. _trigger_timer_phase specifies which of these it is armed
+        #  for and is set when the timer is started.
         self.triggerTimer = QtCore.QTimer(self)
-        self.triggerTimer.timeout.connect(self.TriggerCameras)
+        self.triggerTimer.timeout.connect(self.TriggerTimerExpired)
         self.triggerTimer.setSingleShot(True)
         self.triggerTimer.setTimerType(QtCore.Qt.PreciseTimer)
-
-        #  create the trigger timer
-        self.timeoutTimer = QtCore.QTimer(self)
-        self.timeoutTimer.timeout.connect(self.TriggerTimeout)
-        self.timeoutTimer.setSingleShot(True)
+        self._trigger_timer_phase = self.TRIGGER_PHASE
+
+        #  create the parameter change timer. Pending parameter changes are emitted
+        #  when it expires.
+        self._pending_param_updates = {}
+        self.paramTimer = QtCore.QTimer(self)
+        self.paramTimer.timeout.connect(self.EmitParameterChanges)
+        self.paramTimer.setSingleShot(True)
+        self.paramTimer.setTimerType(QtCore.Qt.CoarseTimer)
+
+        #  create the async data flush timer. Buffered async sensor data are written
+        #  to the database when it expires.
+        self._pending_async_data = []
+        self.asyncFlushTimer = QtCore.QTimer(self)
+        self.asyncFlushTimer.timeout.connect(self.FlushAsyncData)
+        self.asyncFlushTimer.setSingleShot(True)
+        self.asyncFlushTimer.setTimerType(QtCore.Qt.CoarseTimer)
+
+        #  the acquisition module parameters handled by GetParameterRequest and
+        #  SetParameterRequest. Keys are the lower case parameter names.
+        self._acq_get_handlers = {'camera_list': self._GetCameraListParam,
+                                  'is_triggering': self._GetIsTriggeringParam}
+        self._acq_set_handlers = {'start_triggering': self._StartTriggeringParam,
+                                  'stop_triggering': self._StopTriggeringParam,
+                                  'stop_acquisition': self._StopAcquisitionParam}
+
+        #  cache the bound methods called on every trigger
+        self._trigger_emit = self.trigger.emit
+        self._trigger_timer_start = self.triggerTimer.start
+
+        #  and the bound methods called for every sensor datagram
+        self._sensor_data_emit = self.sensorData.emit
 
         #  create the shutdown timer - this is used to delay application
         #  shutdown when no cameras are found. It allows the user to exit
         #  the application and fix the issue when the application is set
-        #  to shut the PC down upon exit.
+        #  to shut the PC down upon exit. The action taken when the timer
+        #  expires is set when the timer is started in StartShutdownTimer.
         self.shutdownTimer = QtCore.QTimer(self)
         self.shutdownTimer.setSingleShot(True)
+        self.shutdownTimer.setTimerType(QtCore.Qt.VeryCoarseTimer)
+        self.shutdownTimer.timeout.connect(self.ShutdownTimerExpired)
+        self.shutdown_action = None
 
         #  connect the stopApp signal to the stopAcquisition method.
         self.stopApp.connect(self.StopAcquisition)
@@ -256,10 +555,7 @@ class AcquisitionBase(QtCore.QObject):
         #  continue the setup after QtCore.QCoreApplication.exec_() is called
         #  by using a timer to call AcquisitionSetup. This ensures that the
         #  application event loop is running when AcquisitionSetup is called.
-        startTimer = QtCore.QTimer(self)
-        startTimer.timeout.connect(self.AcquisitionSetup)
-        startTimer.setSingleShot(True)
-        startTimer.start(0)
+        QtCore.QTimer.singleShot(0, self.AcquisitionSetup)
 
 
     def AcquisitionSetup(self):
@@ -295,26 +591,24 @@ class AcquisitionBase(QtCore.QObject):
         #  set up the application paths
         if self.configuration['application']['output_mode'].lower() == 'combined':
             #  This is a combined deployment - we will not create a deployment directory
-            self.base_dir = os.path.normpath(self.configuration['application']['output_path'])
+            self.base_dir = Path(self.configuration['application']['output_path'])
         else:
             #  If not 'combined' we log data in separate deployment folders. Deployment folders
             #  are named Dyymmdd-Thhmmss where the date and time are derived from the application
             #  start time.
-            self.base_dir = os.path.normpath(self.configuration['application']['output_path'] +
-                    os.sep + start_time_string)
+            self.base_dir = Path(self.configuration['application']['output_path']) / start_time_string
 
         #  create the paths to our logs, images, and settings directories
-        self.log_dir = os.path.normpath(self.base_dir + os.sep + 'logs')
-        self.image_dir = os.path.normpath(self.base_dir + os.sep + 'images')
-        settings_dir = os.path.normpath(self.base_dir + os.sep + 'settings')
+        self.log_dir = self.base_dir / 'logs'
+        self.image_dir = self.base_dir / 'images'
+        settings_dir = self.base_dir / 'settings'
 
         #  set up logging
         try:
-            logfile_name = self.log_dir + os.sep + start_time_string + '.log'
+            logfile_name = str(self.log_dir / (start_time_string + '.log'))
 
             #  make sure we have a directory to log to
-            if not os.path.exists(self.log_dir):
-                os.makedirs(self.log_dir)
+            self.log_dir.mkdir(parents=True, exist_ok=True)
 
             #  create the logger
             self.logger = logging.getLogger('Acquisition')
@@ -329,112 +623,84 @@ class AcquisitionBase(QtCore.QObject):
             consoleLogger.setFormatter(consoleformatter)
             self.logger.addHandler(consoleLogger)
 
-        except:
-            #  we failed to open the log file - bail
+        except (OSError, ValueError) as e:
+            #  we failed to open the log file (or the log level is invalid) - bail
             print("CRITICAL ERROR: Unable to create log file " + logfile_name)
+            print("  Error: " + str(e))
             print("Application exiting...")
             QtCore.QCoreApplication.instance().quit()
             return
 
         #  make sure we have a directory to write images to
         try:
-            if not os.path.exists(self.image_dir):
-                os.makedirs(self.image_dir)
-        except:
+            self.image_dir.mkdir(parents=True, exist_ok=True)
+        except OSError:
             #  if we can't create the logging dir we bail
-            self.logger.critical("Unable to create image logging directory %s." % self.image_dir)
+            self.logger.exception("Unable to create image logging directory %s.", self.image_dir)
             self.logger.critical("Application exiting...")
             QtCore.QCoreApplication.instance().quit()
             return
 
-        #  copy the settings files - we do this so we have a copy of the settings
-        #  for each deployment.
-        try:
-            #  make sure we have a settings directory. Assume that if the
-            #  settings folder exists, we have already copied the files.
-            if not os.path.exists(settings_dir):
-                os.makedirs(settings_dir)
-
-                #  copy the settings and profiles files
-                shutil.copy2(self.config_file, settings_dir)
-                shutil.copy2(self.profiles_file, settings_dir)
-        except:
-            #  we failed to copy the settings?
-            self.logger.warning("Unable to copy settings files to " + settings_dir)
-
-        #  copy the calibration files - this allows one to include camera calibration files
-        #  with the collected data. We only do this if a calibration folder exists and if it
-        #  contains fewer than the max allowed number of files.
-        try:
-            cal_path = os.path.normpath(self.configuration['application']['calibration_path'])
-            dest_dir = os.path.normpath(self.base_dir + os.sep + 'calibration')
-
-            if os.path.exists(cal_path):
-                #  first do a sanity check on the number of files - since this is a blind
-                #  recursive copy, we limit the total number of files to a handful
-                n_check = len(glob.glob(os.path.join(cal_path, '**', '*'), recursive=True))
-
-                if n_check > self.MAX_CAL_FOLDER_FILES:
-                    #  too many files in the cal folder
-                    self.logger.warning("Unable to copy calibration folder. Too many files!")
-                else:
-                    #  there seems to be a sane number of files - copy the directory
-                    shutil.copytree(cal_path, dest_dir)
-                    self.logger.info("Copied calibration folder to " + dest_dir)
-        except:
-            #  we failed to copy the settings?
-            self.logger.warning("Unable to copy calibration folder to " + dest_dir)
-
+        #  copy the settings and calibration files. These are simple file copies that
+        #  don't depend on anything else in setup so we run them in the global thread
+        #  pool while we initialize the camera drivers. _WaitForSetupTasks is called
+        #  below to make sure they have completed before we start acquiring.
+        self._StartSetupTasks(functools.partial(self.CopySettingsFiles, settings_dir),
+                self.CopyCalibrationFiles)
 
         #  log file is set up and directories created. Get some basic info into the logs
         self.logger.info("Camtrawl Acquisition Starting...")
 
+        #  import the modules we deferred at load time
+        _lazy_imports()
+
         #  report versions
-        self.logger.info('Platform: %s %s' % (platform.system(), platform.release()))
-        self.logger.info('Python version: %s' % (sys.version))
-        self.logger.info('Numpy version: %s' % (np.__version__))
-        self.logger.info('OpenCV version: %s' % (cv2.__version__))
-        self.logger.info('protobuf version: %s' % (google.protobuf.__version__))
-        self.logger.info('PyQt version: %s' % (QtCore.QT_VERSION_STR))
-        self.logger.info("CamtrawlAcquisition version: " + self.VERSION)
+        self.logger.info('Platform: %s %s', platform.system(), platform.release())
+        self.logger.info('Python version: %s', sys.version)
+        self.logger.info('Numpy version: %s', np.__version__)
+        self.logger.info('OpenCV version: %s', cv2.__version__)
+        self.logger.info('protobuf version: %s', protobuf.__version__)
+        self.logger.info('PyQt version: %s', QtCore.QT_VERSION_STR)
+        self.logger.info("CamtrawlAcquisition version: %s", self.VERSION)
+        if _YAML_C_LOADER_MISSING:
+            self.logger.warning('PyYAML libyaml support is not available. Install libyaml ' +
+                    'and reinstall PyYAML for faster configuration file parsing.')
 
         #  create a list of enumerated cameras and determine what camera drivers
         #  we will need. Then do any initial setup that is required for the drivers.
         self.logger.info("Enumerating cameras...")
         self.enumerated_cameras = []
-        drivers = []
-        configured_cams = list(self.configuration['cameras'].keys())
-        for camera in configured_cams:
-            #  check if the driver parameter exists (it may not since the default
-            #  camera configuration values have not been merged yet so if it isn't
-            #  explicitly set in the config file, it will not exist.)
-            if 'driver' in self.configuration['cameras'][camera]:
-                #  it does, add this driver to the dict if needed
-                driver = self.configuration['cameras'][camera]['driver'].lower()
-                #  make sure we know about this driver
-                if driver not in self.VALID_DRIVERS:
-                    valid_drivers_str = ','.join(self.VALID_DRIVERS)
-                    self.logger.warning("Camera '" + camera + "' has an unknown driver '" +
-                            self.configuration['cameras'][camera]['driver'] +
-                            "' specified. (valid drivers: " + valid_drivers_str + ") " +
-                            "This camera will be ignored.")
-                    continue
-                #  we do, so we add it to the list, if needed
-                if driver not in drivers:
-                    drivers.append(driver)
-            else:
-                #  there is no 'driver' parameter specified. We will default to
-                #  SpinCamera to provide backwards compatibility.
-                driver = 'spincamera'
-                if 'spincamera' not in drivers:
-                    drivers.append(driver)
+        self._enumerated_set = set()
+        drivers = set()
+
+        #  the 'default' camera section is not a camera. Pull it out of the camera
+        #  configurations so it is only used by GetCameraConfiguration. We still need
+        #  its driver since it is used for cameras that don't have their own section.
+        self.default_camera_config = self.configuration['cameras'].pop('default', None)
+        if self.default_camera_config is not None:
+            driver = self._GetCameraDriver('default', self.default_camera_config)
+            if driver is not None:
+                drivers.add(driver)
+
+        for camera, camera_config in self.configuration['cameras'].items():
+            #  other capitalizations of 'default' are not cameras either
+            if camera.lower() == 'default':
+                continue
+            driver = self._GetCameraDriver(camera, camera_config)
+            if driver is None:
+                #  unknown driver, this camera will be ignored
+                continue
+            drivers.add(driver)
 
             #  add this camera to the list of enumerated cameras
-            if camera.lower() != 'default':
-                self.enumerated_cameras.append(camera)
-
-        #  now, do any initial setup required by the driver(s)
-        for driver in drivers:
+            self.enumerated_cameras.append(camera)
+            self._enumerated_set.add(camera)
+
+        #  now, do any initial setup required by the driver(s). We work through
+        #  VALID_DRIVERS so the drivers are always initialized in the same order.
+        for driver in self.VALID_DRIVERS:
+            if driver not in drivers:
+                continue
             if driver == 'spincamera':
                 self.logger.info("At least one camera is configured to use the SpinCamera driver." +
                         " Initializing Spinnaker/PySpin...")
@@ -443,14 +709,22 @@ class AcquisitionBase(QtCore.QObject):
                     #  use our import_module function
                     import_module('PySpin')
                     import_module('SpinCamera')
+                except ImportError:
+                    #  if we can't import this driver we bail
+                    self.logger.exception("Error importing PySpin. Have you installed the " +
+                            "Spinnaker SDK and PySpin correctly?")
+                    self.logger.critical("Application exiting...")
+                    QtCore.QCoreApplication.instance().quit()
+                    return
 
+                try:
                     #  set up the camera interface
                     self.spin_system = PySpin.System.GetInstance()
 
                     #  report the spinnaker version
                     version = self.spin_system.GetLibraryVersion()
-                    self.logger.info('  Spinnaker/PySpin library version: %d.%d.%d.%d' % (version.major,
-                        version.minor, version.type, version.build))
+                    self.logger.info('  Spinnaker/PySpin library version: %d.%d.%d.%d', version.major,
+                        version.minor, version.type, version.build)
 
                     self.logger.info("  Identifying Flir cameras connected to the system:")
                     spin_cameras = self.spin_system.GetCameras()
@@ -462,32 +736,31 @@ class AcquisitionBase(QtCore.QObject):
                     #  if they aren't already there.
                     for camera in spin_cameras:
 
-                        #  extract the camera name from the Spin camera pointer - 'tis a bit involved....
-                        device_info = {}
+                        #  extract the camera name from the Spin camera pointer. We only need the
+                        #  model name and serial number so we read those nodes directly.
                         nodemap_tldevice = camera.GetTLDeviceNodeMap()
-                        node_device_information = PySpin.CCategoryPtr(nodemap_tldevice.GetNode('DeviceInformation'))
-                        if PySpin.IsAvailable(node_device_information) and PySpin.IsReadable(node_device_information):
-                            features = node_device_information.GetFeatures()
-                            for feature in features:
-                                node_feature = PySpin.CValuePtr(feature)
-                                device_info[node_feature.GetName()] = (node_feature.ToString()
-                                        if PySpin.IsReadable(node_feature) else 'Node not readable')
+                        node_model = PySpin.CStringPtr(nodemap_tldevice.GetNode('DeviceModelName'))
+                        node_serial = PySpin.CStringPtr(nodemap_tldevice.GetNode('DeviceSerialNumber'))
+                        model = (node_model.GetValue() if PySpin.IsReadable(node_model)
+                                else 'Node not readable')
+                        serial = (node_serial.GetValue() if PySpin.IsReadable(node_serial)
+                                else 'Node not readable')
 
                         #  for spinnaker cameras, we create the camera name using the model name,
                         #  underscore and the serial number.
-                        camera_name = device_info['DeviceModelName'] + '_' + \
-                                device_info['DeviceSerialNumber']
+                        camera_name = model + '_' + serial
 
                         #  log the detected camera and add it to the spin_cameras list
-                        self.logger.info("    " + camera_name)
+                        self.logger.info("    %s", camera_name)
                         self.spin_cameras[camera_name] = camera
 
-                        if camera_name not in self.enumerated_cameras:
+                        if camera_name not in self._enumerated_set:
                             self.enumerated_cameras.append(camera_name)
+                            self._enumerated_set.add(camera_name)
 
-                except:
+                except PySpin.SpinnakerException:
                     #  if we can't initialize this driver we bail
-                    self.logger.critical("Error obtaining PySpin system instance. Have you installed the " +
+                    self.logger.exception("Error obtaining PySpin system instance. Have you installed the " +
                             "Spinnaker SDK and PySpin correctly?")
                     self.logger.critical("Application exiting...")
                     QtCore.QCoreApplication.instance().quit()
@@ -500,9 +773,9 @@ class AcquisitionBase(QtCore.QObject):
                         "CV2VideoCamera driver. Importing CV2VideoCamera...")
                 try:
                     import_module('CV2VideoCamera')
-                except:
+                except ImportError:
                     #  if we can't import this driver we bail
-                    self.logger.critical("Error importing CV2VideoCamera!")
+                    self.logger.exception("Error importing CV2VideoCamera!")
                     self.logger.critical("Application exiting...")
                     QtCore.QCoreApplication.instance().quit()
                     return
@@ -517,61 +790,74 @@ class AcquisitionBase(QtCore.QObject):
         elif num_cameras == 1:
             self.logger.info('Enumeration complete. 1 camera found.')
         else:
-            self.logger.info('Enumeration complete. %d cameras found.' % num_cameras)
+            self.logger.info('Enumeration complete. %d cameras found.', num_cameras)
 
         #  note the config files we loaded
-        self.logger.info("Configuration file loaded: " + self.config_file)
-        self.logger.info("Profiles file loaded: " + self.profiles_file)
-        self.logger.info("Logging data to: " + self.base_dir)
+        self.logger.info("Configuration file loaded: %s", self.config_file)
+        self.logger.info("Profiles file loaded: %s", self.profiles_file)
+        self.logger.info("Logging data to: %s", self.base_dir)
 
         #  set the default_is_synchronous sensor data property
-        if self.configuration['sensors']['default_type'].lower() in ['synchronous', 'syncd', 'sync', 'synced']:
-            self.default_is_synchronous = True
-        else:
-            self.default_is_synchronous = False
+        self.default_is_synchronous = (self.configuration['sensors']['default_type'].lower() in
+                self._SYNC_ALIASES)
 
         #  open/create the image metadata database file
         self.OpenDatabase()
 
         #  insert the deployment metadata
         if self.use_db:
-            self.db.set_deployment_metadata(self.configuration['metadata']['vessel_name'],
+            #  from here on the database is written to in the database writer thread
+            self.StartDatabaseWriter()
+            self.dbWrite.emit('set_deployment_metadata', (self.configuration['metadata']['vessel_name'],
                     self.configuration['metadata']['survey_name'],
                     self.configuration['metadata']['camera_name'],
                     self.configuration['metadata']['survey_description'],
-                    start_time)
+                    start_time))
+
+        #  make sure the settings and calibration copies have finished
+        self._WaitForSetupTasks()
+
+        #  cache the configuration values used in our timer and trigger callbacks
+        self._bind_hot_config()
 
         #  log the acquisition rate and max image count
-        self.logger.info("Acquisition Rate: %d images/sec   Max image count: %d" %
-                (self.configuration['acquisition']['trigger_rate'],
-                self.configuration['acquisition']['trigger_limit']))
+        self.logger.info("Acquisition Rate: %d images/sec   Max image count: %d",
+                self._trigger_rate, self._trigger_limit)
 
         #  check if we should check the available free space on our destination device.
         if self.configuration['application']['disk_free_monitor']:
 
             #  get the starting free space and report
-            disk_stats = shutil.disk_usage(self.image_dir)
-            disk_free_mb = disk_stats.free / 1024 / 1024
+            disk_free_mb = DiskMonitor.disk_free_mb(self.image_dir)
 
             #  check if we even have enough space to start
-            if disk_free_mb <= self.configuration['application']['disk_free_min_mb']:
+            if disk_free_mb <= self._disk_free_min_mb:
                 #  no, don't got the space
                 self.disk_ok = False
-                self.logger.critical("CRITICAL ERROR: Free space: %d MB is less than the " % (disk_free_mb) +
-                    "minimum allowed %d MB" % (self.configuration['application']['disk_free_min_mb']))
+                self.logger.critical("CRITICAL ERROR: Free space: %d MB is less than the " +
+                    "minimum allowed %d MB", disk_free_mb, self._disk_free_min_mb)
                 self.logger.critical("Application exiting due to lack of free disk space")
             else:
                 #  free space is greater than min
                 self.disk_ok = True
                 self.logger.info("Starting to monitor disk free space. Starting free space: " +
-                        "%d MB. Minimum free space set to: %d MB" % (disk_free_mb,
-                        self.configuration['application']['disk_free_min_mb']))
-
-                #  Create a timer to periodically check the disk free space
-                self.diskStatTimer = QtCore.QTimer(self)
-                self.diskStatTimer.timeout.connect(self.CheckDiskFreeSpace)
-                self.diskStatTimer.setSingleShot(False)
-                self.diskStatTimer.start(self.configuration['application']['disk_free_check_int_ms'])
+                        "%d MB. Minimum free space set to: %d MB", disk_free_mb,
+                        self._disk_free_min_mb)
+
+                #  Create the disk monitor to periodically check the disk free space. It runs
+                #  in its own thread so a slow disk doesn't stall our event loop.
+                self.diskMonitor = DiskMonitor.DiskMonitor(self.image_dir,
+                        self.configuration['application']['disk_free_check_int_ms'])
+                self.diskMonitorThread = QtCore.QThread(self)
+                self.diskMonitor.moveToThread(self.diskMonitorThread)
+                #  the disk free results are always delivered to us through our event loop
+                self.diskMonitor.diskFree.connect(self.CheckDiskFreeSpace,
+                        QtCore.Qt.QueuedConnection)
+                self.stopDiskMonitor.connect(self.diskMonitor.stopMonitoring)
+                self.diskMonitorThread.started.connect(self.diskMonitor.startMonitoring)
+                self.diskMonitor.monitorStopped.connect(self.diskMonitorThread.quit,
+                        QtCore.Qt.DirectConnection)
+                self.diskMonitorThread.start()
         else:
             #  we're not checking the disk free space
             self.disk_ok = True
@@ -592,56 +878,51 @@ class AcquisitionBase(QtCore.QObject):
         #  now set up sensors if any are specified in the yml file
         if len(self.configuration['sensors']['installed_sensors']) > 0:
             self.logger.info("Adding sensors:")
-            for sensor_name in self.configuration['sensors']['installed_sensors']:
+            sync_headers = self.configuration['sensors']['synchronous']
+            async_headers = self.configuration['sensors']['asynchronous']
+            for sensor_name, sensor_cfg in self.configuration['sensors']['installed_sensors'].items():
 
                 #  determine if the type for this sensor is provided - if so, set the is_synchronous
                 #  key so we know if it is synced or not when we log it.
-                if 'type' in self.configuration['sensors']['installed_sensors'][sensor_name]:
-                    if (self.configuration['sensors']['installed_sensors'][sensor_name]['type'].lower() in
-                            ['synced', 'sync', 'synchronous']):
-                        self.configuration['sensors']['installed_sensors'][sensor_name]['is_synchronous'] = True
-                    else:
-                        self.configuration['sensors']['installed_sensors'][sensor_name]['is_synchronous'] = False
+                sensor_type = sensor_cfg.get('type')
+                if sensor_type is not None:
+                    sensor_cfg['is_synchronous'] = sensor_type.lower() in self._SYNC_ALIASES
                 else:
                     #  type was not provided so we use the default
-                    self.configuration['sensors']['installed_sensors'][sensor_name]['is_synchronous'] = \
-                            self.default_is_synchronous
+                    sensor_cfg['is_synchronous'] = self.default_is_synchronous
 
                 #  now add any per header synced/async configs - this overrides the type
-                if 'synced_headers' in self.configuration['sensors']['installed_sensors'][sensor_name]:
-                    for header in self.configuration['sensors']['installed_sensors'][sensor_name]['synced_headers']:
-                        self.configuration['sensors']['synchronous'].append(header)
-                if 'async_headers' in self.configuration['sensors']['installed_sensors'][sensor_name]:
-                    for header in self.configuration['sensors']['installed_sensors'][sensor_name]['async_headers']:
-                        self.configuration['sensors']['asynchronous'].append(header)
-
-                if 'serial_port' in self.configuration['sensors']['installed_sensors'][sensor_name]:
-                    port = self.configuration['sensors']['installed_sensors'][sensor_name]['serial_port']
-                else:
-                    #  if port is not defined, we assume the sensor is not local
-                    port = None
+                sync_headers.extend(sensor_cfg.get('synced_headers') or ())
+                async_headers.extend(sensor_cfg.get('async_headers') or ())
 
-                #  check if 'ignore_headers' is set and add an empty list if it is missing
-                if 'ignore_headers' not in self.configuration['sensors']['installed_sensors'][sensor_name]:
-                    self.configuration['sensors']['installed_sensors'][sensor_name]['ignore_headers'] = []
+                #  if port is not defined, we assume the sensor is not local
+                port = sensor_cfg.get('serial_port')
+
+                #  check if 'ignore_headers' is set and store it as a set for fast lookups
+                sensor_cfg['ignore_headers'] = frozenset(sensor_cfg.get('ignore_headers') or ())
 
                 #  check if we're adding a header to this sensor's data messages
-                if 'add_header' in self.configuration['sensors']['installed_sensors'][sensor_name]:
+                header = sensor_cfg.get('add_header')
+                if header is not None:
                     #  yes, make sure it is a string without leading/trailing whitespace
-                    header = str(self.configuration['sensors']['installed_sensors'][sensor_name]['add_header']).strip()
-                    self.configuration['sensors']['installed_sensors'][sensor_name]['add_header'] = header
+                    sensor_cfg['add_header'] = str(header).strip()
+                    header = sensor_cfg['add_header']
+
+                #  cache the header (or None) for SerialDataReceived
+                self._sensor_headers[sensor_name] = header
 
                 #  set up the logging interval if required
-                if 'logging_interval_ms' in self.configuration['sensors']['installed_sensors'][sensor_name]:
-                    self.configuration['sensors']['installed_sensors'][sensor_name]['last_write'] = None
+                if sensor_cfg.get('logging_interval_ms') is not None:
+                    sensor_cfg['last_write_ms'] = None
                 else:
-                    self.configuration['sensors']['installed_sensors'][sensor_name]['logging_interval_ms'] = None
+                    sensor_cfg['logging_interval_ms'] = None
 
                 #  see if the baud rate is provided
-                if 'serial_baud' in self.configuration['sensors']['installed_sensors'][sensor_name]:
+                baud = sensor_cfg.get('serial_baud')
+                if baud is not None:
                     try:
-                        baud = int(self.configuration['sensors']['installed_sensors'][sensor_name]['serial_baud'])
-                    except:
+                        baud = int(baud)
+                    except (TypeError, ValueError):
                         #  if baud is not a number, default to 4800
                         baud = 4800
                 else:
@@ -655,20 +936,160 @@ class AcquisitionBase(QtCore.QObject):
                         self.serialSensors.addDevice(sensor_name, port, baud, 'None', '', 0)
                         #  and try to open the port
                         self.serialSensors.startMonitoring(devices=sensor_name)
-                        self.logger.info("   added sensor: " + sensor_name +
-                                " // port:" + port + " // baud:" + str(baud))
+                        self.logger.info("   added sensor: %s // port:%s // baud:%s", sensor_name,
+                                port, baud)
 
                     except Exception as e:
                         #  ran into an issue with the serial port
-                        self.logger.error("   Error opening serial port for sensor: " + sensor_name +
-                                " // port:" + port + " // baud:" + str(baud))
-                        self.logger.error("   " + str(e))
+                        self.logger.error("   Error opening serial port for sensor: %s // port:%s // baud:%s",
+                                sensor_name, port, baud)
+                        self.logger.error("   %s", e)
+
+        #  cache the sensor configuration used by SensorDataAvailable
+        self._bind_sensor_config()
 
         #  continue camera setup in another method so we can override that method
         #  in a subclass and allow for additional pre-camera setup.
         self.AcquisitionSetup2()
 
 
+    def _bind_sensor_config(self):
+        '''_bind_sensor_config caches the installed sensor configuration and builds the
+        header to is_synchronous lookup table used by SensorDataAvailable. This must be
+        called again if the sensor configuration is changed after setup.
+        '''
+        self._installed_sensors = self.configuration['sensors']['installed_sensors']
+
+        #  headers listed as synchronous take precedence over asynchronous
+        is_sync = dict.fromkeys(self.configuration['sensors']['asynchronous'], False)
+        is_sync.update(dict.fromkeys(self.configuration['sensors']['synchronous'], True))
+        self._is_sync_by_header = is_sync
+
+        #  clear the cached sensor actions since they may have changed
+        self._sensor_actions = {}
+
+
+    def _GetSensorAction(self, sensor_id, header):
+        '''_GetSensorAction determines how SensorDataAvailable handles data from the specified
+        sensor and header and returns an (action, sensor config) tuple. The result is cached in
+        _sensor_actions so this is only called the first time a sensor/header pair is seen.
+        '''
+        sensor_cfg = self._installed_sensors.get(sensor_id)
+        if sensor_cfg is None:
+            #  this sensor isn't installed - the data are not logged
+            action = (self.SENSOR_NOT_LOGGED, None)
+        elif header in sensor_cfg['ignore_headers']:
+            action = (self.SENSOR_IGNORE, sensor_cfg)
+        elif self._is_sync_by_header.get(header, self.default_is_synchronous):
+            action = (self.SENSOR_SYNC, sensor_cfg)
+        else:
+            action = (self.SENSOR_ASYNC, sensor_cfg)
+
+        #  limit the cache size in case a sensor is sending garbled headers
+        if len(self._sensor_actions) < self.MAX_SENSOR_ACTIONS:
+            self._sensor_actions[(sensor_id, header)] = action
+
+        return action
+
+
+    def _bind_hot_config(self):
+        '''_bind_hot_config copies configuration values that are read in the trigger
+        and timer callbacks into instance attributes. These values do not change after
+        the configuration is read and this avoids repeated nested dict lookups in the
+        code that runs on every trigger. If a future change allows these configuration
+        values to be changed at runtime, this method must be called again after the change.
+        '''
+        self._trigger_rate = self.configuration['acquisition']['trigger_rate']
+        self._trigger_interval_ns = int(1e9 / self._trigger_rate)
+        self._trigger_limit = self.configuration['acquisition']['trigger_limit']
+        self._video_sync_data_divider = self.configuration['acquisition']['video_sync_data_divider']
+        self._still_sync_data_divider = self.configuration['acquisition']['still_sync_data_divider']
+        self._video_log_frames = self.configuration['acquisition']['video_log_frames']
+        self._disk_free_min_mb = self.configuration['application']['disk_free_min_mb']
+        self._shut_down_on_exit = self.configuration['application']['shut_down_on_exit']
+        self._synchronous_timeout_secs = self.configuration['sensors']['synchronous_timeout_secs']
+        self._commit_every_n_triggers = max(1, self.configuration['application']['commit_every_n_triggers'])
+
+
+    def CopySettingsFiles(self, settings_dir):
+        '''CopySettingsFiles copies the configuration and video profiles files to the
+        deployment's settings directory so we have a copy of the settings for each
+        deployment. This method is run in a worker thread during setup.
+        '''
+        try:
+            #  make sure we have a settings directory. Assume that if the
+            #  settings folder exists, we have already copied the files.
+            if not settings_dir.exists():
+                settings_dir.mkdir(parents=True)
+
+                #  copy the settings and profiles files
+                shutil.copy2(self.config_file, settings_dir)
+                shutil.copy2(self.profiles_file, settings_dir)
+        except OSError:
+            #  we failed to copy the settings?
+            self.logger.warning("Unable to copy settings files to %s", settings_dir, exc_info=True)
+
+
+    def CopyCalibrationFiles(self):
+        '''CopyCalibrationFiles copies the calibration files - this allows one to include
+        camera calibration files with the collected data. We only do this if a calibration
+        folder exists and if it contains fewer than the max allowed number of files. This
+        method is run in a worker thread during setup.
+        '''
+        try:
+            cal_path = os.path.normpath(self.configuration['application']['calibration_path'])
+            dest_dir = str(self.base_dir / 'calibration')
+
+            if os.path.exists(cal_path):
+                #  first do a sanity check on the number of files - since this is a blind
+                #  recursive copy, we limit the total number of files to a handful
+                n_check = _count_files_capped(cal_path, self.MAX_CAL_FOLDER_FILES)
+
+                if n_check > self.MAX_CAL_FOLDER_FILES:
+                    #  too many files in the cal folder
+                    self.logger.warning("Unable to copy calibration folder. Too many files!")
+                else:
+                    #  there seems to be a sane number of files - copy the directory
+                    _fast_copytree(cal_path, dest_dir)
+                    self.logger.info("Copied calibration folder to %s", dest_dir)
+        except OSError:
+            #  we failed to copy the calibration folder?
+            self.logger.warning("Unable to copy calibration folder to %s", dest_dir, exc_info=True)
+
+
+    def _StartSetupTasks(self, *tasks):
+        '''_StartSetupTasks runs the provided callables in the global QThreadPool.
+        Call _WaitForSetupTasks to wait for them to complete.
+        '''
+        self.setup_tasks = []
+        self.setup_tasks_pending = len(tasks)
+        self.setup_task_loop = QtCore.QEventLoop(self)
+        for task in tasks:
+            runnable = _SetupTask(task)
+            runnable.signals.finished.connect(self._SetupTaskFinished)
+            #  keep a reference so the runnable's signals object outlives the task
+            self.setup_tasks.append(runnable)
+            QtCore.QThreadPool.globalInstance().start(runnable)
+
+
+    def _WaitForSetupTasks(self):
+        '''_WaitForSetupTasks runs a local event loop until all of the tasks started
+        by _StartSetupTasks have finished.
+        '''
+        if self.setup_tasks_pending > 0:
+            self.setup_task_loop.exec_()
+        self.setup_tasks = []
+
+
+    @QtCore.pyqtSlot()
+    def _SetupTaskFinished(self):
+        '''_SetupTaskFinished is called when a setup task completes.
+        '''
+        self.setup_tasks_pending -= 1
+        if self.setup_tasks_pending == 0:
+            self.setup_task_loop.quit()
+
+
     def AcquisitionSetup2(self):
         '''
         AcquisitionSetup2 completes setup by configuring the cameras and
@@ -699,7 +1120,7 @@ class AcquisitionBase(QtCore.QObject):
             #  start the trigger timer. Set a long initial interval
             #  to allow the cameras time to finish getting ready.
             self.isTriggering = True
-            self.triggerTimer.start(1000)
+            self.StartTriggerTimer(1000)
 
         else:
             #  no, something didn't work out so check if we're supposed to shut down.
@@ -713,40 +1134,142 @@ class AcquisitionBase(QtCore.QObject):
                 #  set the shutdownOnExit attribute so we, er shutdown on exit
                 self.shutdownOnExit = True
 
-                #  complete setup of our shutdown timer and start it
-                self.shutdownTimer.timeout.connect(self.AcqisitionTeardown)
                 #  delay shutdown for 5 minutes
-                self.shutdownTimer.start(5000 * 60)
+                self.StartShutdownTimer(5000 * 60, self.AcqisitionTeardown)
 
             else:
                 #  Stop acquisition and close the app
                 self.StopAcquisition(exit_app=True, shutdown_on_exit=False)
 
 
-    @QtCore.pyqtSlot()
-    def CheckDiskFreeSpace(self):
+    def _GetCameraDriver(self, camera, camera_config):
+        '''_GetCameraDriver returns the lower case driver name specified in a camera's
+        configuration section or None if the driver is unknown.
         '''
-        CheckDiskFreeSpace checks the available free space for the data directory and
-        stops acquisition if it drops below the min threshold.
+        #  check if the driver parameter exists (it may not since the default
+        #  camera configuration values have not been merged yet so if it isn't
+        #  explicitly set in the config file, it will not exist.)
+        if 'driver' not in camera_config:
+            #  there is no 'driver' parameter specified. We will default to
+            #  SpinCamera to provide backwards compatibility.
+            return 'spincamera'
+
+        driver = camera_config['driver'].lower()
+        #  make sure we know about this driver
+        if driver not in self.VALID_DRIVERS:
+            valid_drivers_str = ','.join(self.VALID_DRIVERS)
+            self.logger.warning("Camera '%s' has an unknown driver '%s' specified. " +
+                    "(valid drivers: %s) This camera will be ignored.", camera,
+                    camera_config['driver'], valid_drivers_str)
+            return None
+
+        return driver
+
+
+    def _MakeSpinCamera(self, cam, config):
+        '''_MakeSpinCamera creates a SpinCamera object for the specified camera. It
+        returns a tuple of (camera object, configured exposure) or None if the camera
+        could not be created.
         '''
+        #  first check that this camera is available
+        if cam not in self.spin_cameras:
+            #  a spinnaker camera is specified in the config file but apparently not connected
+            self.logger.warning("    Spin camera '%s' specified in configuration file " +
+                    "but is not connected. This camera will be skipped.", cam)
+            return None
+
+        #  create a camera object that uses Flir Spinnaker/PySpin as the
+        #  interface to the camera.
+        sc = SpinCamera.SpinCamera(self.spin_cameras[cam])
+
+        return sc, config['exposure_us']
 
-        #  get the disk free space in MB
-        disk_stats = shutil.disk_usage(self.image_dir)
-        disk_free_mb = disk_stats.free / 1024 / 1024
 
-        if disk_free_mb <= self.configuration['application']['disk_free_min_mb']:
+    def _MakeCV2Camera(self, cam, config):
+        '''_MakeCV2Camera creates a CV2VideoCamera object for the specified camera. It
+        returns a tuple of (camera object, configured exposure) or None if the camera
+        could not be created.
+        '''
+        #  get some params required at instantiation
+        resolution = [None, None]
+        width = config.get('cv2_cam_width')
+        if width is not None:
+            resolution[0] = int(width)
+        height = config.get('cv2_cam_height')
+        if height is not None:
+            resolution[1] = int(height)
+        cam_path = config.get('cv2_cam_path', 0)
+        backend = config.get('cv2_cam_backend')
+        if backend is not None:
+            backend = backend.strip()
+
+        try:
+            #  create an instance of CV2VideoCamera which uses CV2.VideoCapture
+            #  as the interface to the camera.
+            sc = CV2VideoCamera.CV2VideoCamera(cam_path, cam, resolution=resolution,
+                    backend=backend)
+        except Exception as e:
+            self.logger.warning("    Unable to instantiate driver for camera '%s'", cam)
+            self.logger.warning("    Error: %s", e)
+            self.logger.warning("    This camera will be ignored.")
+            return None
+
+        #  report some driver specific details
+        self.logger.info('    %s: OpenCV VideoCapture initialized. Using %s backend',
+                sc.camera_name, sc.cv_backend)
+        if resolution[0] and resolution[1]:
+            self.logger.info('    %s: Configured Resolution %ix%i  Actual Resolution %ix%i',
+                    sc.camera_name, resolution[0], resolution[1],
+                    sc.resolution[0], sc.resolution[1])
+        else:
+            self.logger.info('    %s: Configured Resolution <not specified> Actual Resolution %ix%i',
+                    sc.camera_name, sc.resolution[0], sc.resolution[1])
+
+        #  get the exposure config value for this driver
+        return sc, config.get('exposure')
+
+
+    def StartShutdownTimer(self, delay_ms, action):
+        '''StartShutdownTimer starts (or restarts) the shutdown timer. The callable
+        action is called when the timer expires. The timer's timeout signal is only
+        connected once so starting the timer multiple times doesn't stack up
+        connections to different actions.
+        '''
+        self.shutdown_action = action
+        self.shutdownTimer.start(delay_ms)
 
-            #  stop the timer
-            self.diskStatTimer.stop()
+
+    @QtCore.pyqtSlot()
+    def ShutdownTimerExpired(self):
+        '''ShutdownTimerExpired is called when the shutdown timer expires and calls
+        the action passed to StartShutdownTimer.
+        '''
+        action = self.shutdown_action
+        self.shutdown_action = None
+        if action is not None:
+            action()
+
+
+    @QtCore.pyqtSlot(int)
+    def CheckDiskFreeSpace(self, disk_free_mb):
+        '''
+        CheckDiskFreeSpace is called by the disk monitor with the available free space
+        for the data directory and stops acquisition if it drops below the min threshold.
+        '''
+
+        if disk_free_mb <= self._disk_free_min_mb:
+
+            #  stop the disk monitor
+            self.stopDiskMonitor.emit()
 
             #  Log that we're stopping because we're out of disk space
             self.logger.critical("The system is stopping because the data disk is full.")
-            self.logger.critical("  Free space: %d MB is less than the " % (disk_free_mb) +
-                    "minimum allowed %d MB" % (self.configuration['application']['disk_free_min_mb']))
+            self.logger.critical("  Free space: %d MB is less than the minimum allowed %d MB",
+                    disk_free_mb, self._disk_free_min_mb)
 
             #  Stop acquisition and close the app
             self.StopAcquisition(exit_app=True,
-                    shutdown_on_exit=self.configuration['application']['shut_down_on_exit'])
+                    shutdown_on_exit=self._shut_down_on_exit)
 
 
     def ConfigureCameras(self):
@@ -757,13 +1280,28 @@ class AcquisitionBase(QtCore.QObject):
         """
         #  initialize some properties
         self.cameras = {}
+        self._camera_names = ()
+        self.camera_params = {}
         self.threads = []
         self.received = {}
+        self._pending_cameras = 0
         self.this_images = 1
         self.controller_port = {}
         self.hw_triggered_cameras = []
         self.hwTriggered = False
 
+        #  get the application wide settings used in the camera loop
+        ffmpeg_path = self.configuration['application']['ffmpeg_path']
+        if ffmpeg_path in [None, '']:
+            #  Empty/None assumes ffmpeg is on the system path
+            ffmpeg_path = None
+        else:
+            #  convert relative paths to absolute
+            if ffmpeg_path.startswith(('./', '.\\')):
+                ffmpeg_path = os.path.join(self._script_dir, ffmpeg_path)
+            ffmpeg_path = os.path.normpath(ffmpeg_path)
+        trigger_rate = self._trigger_rate
+
         # Retrieve list of cameras from the system
         self.logger.info('Configuring cameras...')
 
@@ -777,139 +1315,78 @@ class AcquisitionBase(QtCore.QObject):
 
             if add_camera:
                 #  we have an entry for this camera so we'll use it
-                self.logger.info("  Adding: " + cam)
-
-                #  create an instance of the appropriate camera driver class
-                if config['driver'].lower() == 'spincamera':
-                    #  first check that this camera is available
-                    if cam not in self.spin_cameras:
-                        #  a spinnaker camera is specified in the config file but apparently not connected
-                        self.logger.warning("    Spin camera '" + cam + "' specified in configuration file " +
-                                "but is not connected. This camera will be skipped.")
-                        continue
+                self.logger.info("  Adding: %s", cam)
 
-                    #  create a camera object that uses Flir Spinnaker/PySpin as the
-                    #  interface to the camera.
-                    sc = SpinCamera.SpinCamera(self.spin_cameras[cam])
-
-                    #  get the exposure config value for this driver
-                    this_exposure = config['exposure_us']
-
-                elif config['driver'].lower() == 'cv2videocamera':
-                    #  create a camera object that uses CV2.VideoCapture as the
-                    #  interface to the camera.
-
-                    #  get some params required at instantiation
-                    resolution = [None, None]
-                    if 'cv2_cam_width' in config:
-                        resolution[0] = int(config['cv2_cam_width'])
-                    if 'cv2_cam_height' in config:
-                        resolution[1] = int(config['cv2_cam_height'])
-                    if 'cv2_cam_path' not in config:
-                        cam_path = 0
-                    else:
-                        cam_path = config['cv2_cam_path']
-                    if 'cv2_cam_backend' in config:
-                        backend = config['cv2_cam_backend'].strip()
-                    else:
-                        backend = None
+                #  convert the config dict to a CameraCfg record. The driver specific
+                #  cv2_* options are not part of the record and are read from config.
+                if str(config['hdr_response_file']).lower() == 'none':
+                    config['hdr_response_file'] = None
+                cfg = self.CameraCfg._make(config[field] for field in self.CameraCfg._fields)
 
-                    #  get the exposure config value for this driver
-                    if 'exposure' in config:
-                        this_exposure = config['exposure']
-                    else:
-                        this_exposure = None
-
-                    try:
-                        #  create an instance of CV2VideoCamera
-                        sc = CV2VideoCamera.CV2VideoCamera(cam_path, cam, resolution=resolution,
-                                backend=backend)
-
-                        #  report some driver specific details
-                        self.logger.info(('    %s: OpenCV VideoCapture initialized. Using %s backend') %
-                                (sc.camera_name, sc.cv_backend))
-                        if resolution[0] and resolution[1]:
-                            self.logger.info(('    %s: Configured Resolution %ix%i  Actual Resolution %ix%i') %
-                                    (sc.camera_name, resolution[0], resolution[1],
-                                    sc.resolution[0], sc.resolution[1]))
-                        else:
-                            self.logger.info(('    %s: Configured Resolution <not specified> Actual Resolution %ix%i') %
-                                    (sc.camera_name, sc.resolution[0], sc.resolution[1]))
-
-                    except Exception as e:
-                        self.logger.warning("    Unable to instantiate driver for camera '" + cam + "'")
-                        self.logger.warning("    Error: " + str(e))
-                        self.logger.warning("    This camera will be ignored.")
-                        continue
+                #  create an instance of the appropriate camera driver class
+                factory = getattr(self, self._CAMERA_FACTORIES[cfg.driver.lower()])
+                result = factory(cam, config)
+                if result is None:
+                    #  the factory has logged the reason, this camera will be skipped
+                    continue
+                sc, this_exposure = result
 
                 #  set up the options for saving image data
-                image_options = {'file_ext':config['still_image_extension'],
-                                 'jpeg_quality':config['jpeg_quality'],
-                                 'scale':config['image_scale']}
+                image_options = {'file_ext':cfg.still_image_extension,
+                                 'jpeg_quality':cfg.jpeg_quality,
+                                 'scale':cfg.image_scale}
 
                 #  create the default video profile
                 video_profile = AcquisitionBase.DEFAULT_VIDEO_PROFILE
 
                 #  update it with the options from this camera's config
-                if config['video_preset'] in self.video_profiles:
+                if cfg.video_preset in self.video_profiles:
                     #  update the video profile dict with the preset values
-                    #video_profile.update(self.video_profiles[config['video_preset']])
-                    video_profile = self.video_profiles[config['video_preset']]
+                    #video_profile.update(self.video_profiles[cfg.video_preset])
+                    video_profile = self.video_profiles[cfg.video_preset]
 
                 #  insert the scaling factor into the video profile
-                video_profile['scale'] = config['video_scale']
+                video_profile['scale'] = cfg.video_scale
 
                 #  set the video framerate - framerate (in frames/sec) is passed to the
                 #  video encoder when recording video files.
-                if config['video_force_framerate'] > 0:
+                if cfg.video_force_framerate > 0:
                     #  the user has chosen to override the system acquisition rate
-                    video_profile['framerate'] = config['video_force_framerate']
+                    video_profile['framerate'] = cfg.video_force_framerate
                 else:
                     #  use the system acquisition rate as the video framerate
-                    video_profile['framerate'] = self.configuration['acquisition']['trigger_rate']
+                    video_profile['framerate'] = trigger_rate
 
-                #  insert the ffmpeg path to the video profile. Convert relative paths to
-                #  absolute. Empty/None assumes ffmpeg is on the system path
-                if self.configuration['application']['ffmpeg_path'] in [None, '']:
-                    video_profile['ffmpeg_path'] = None
-                else:
-                    if self.configuration['application']['ffmpeg_path'][0:1] in ['./', '.\\']:
-                        #  get the directory containing this script
-                        ffpath = functools.reduce(lambda l,r: l + os.path.sep + r,
-                                os.path.dirname(os.path.realpath(__file__)).split(os.path.sep))
-                    else:
-                        ffpath = self.configuration['application']['ffmpeg_path']
-                    video_profile['ffmpeg_path'] = os.path.normpath(ffpath)
+                #  insert the ffmpeg path to the video profile
+                video_profile['ffmpeg_path'] = ffmpeg_path
 
                 #  add or update this camera in the database
                 if self.use_db:
-                    link_speed = 0
-                    if 'DeviceCurrentSpeed' in sc.device_info:
-                        link_speed =  sc.device_info['DeviceCurrentSpeed']
-                    elif 'DeviceLinkSpeed' in sc.device_info:
-                        link_speed = sc.device_info['DeviceLinkSpeed']
-                    self.db.update_camera(sc.camera_name, sc.device_info['DeviceID'], sc.camera_id,
-                            config['label'], config['rotation'], sc.device_info['DeviceVersion'],
-                            str(link_speed))
+                    link_speed = sc.device_info.get('DeviceCurrentSpeed')
+                    if link_speed is None:
+                        link_speed = sc.device_info.get('DeviceLinkSpeed', 0)
+                    self.dbWrite.emit('update_camera', (sc.camera_name, sc.device_info['DeviceID'],
+                            sc.camera_id, cfg.label, cfg.rotation, sc.device_info['DeviceVersion'],
+                            str(link_speed)))
 
                 # Set the camera's label
-                sc.label = config['label']
+                sc.label = cfg.label
 
                 #  set the camera trigger and saving dividers
-                sc.save_stills = config['save_stills']
-                sc.save_stills_divider = config['still_image_divider']
-                sc.save_video = config['save_video']
-                sc.save_video_divider = config['video_frame_divider']
-                sc.trigger_divider = config['trigger_divider']
-                self.logger.info(('    %s: trigger divider: %d  save image divider: %d' +
-                        '  save frame divider: %d') % (sc.camera_name, sc.trigger_divider,
-                        sc.save_stills_divider, sc.save_video_divider))
+                sc.save_stills = cfg.save_stills
+                sc.save_stills_divider = cfg.still_image_divider
+                sc.save_video = cfg.save_video
+                sc.save_video_divider = cfg.video_frame_divider
+                sc.trigger_divider = cfg.trigger_divider
+                self.logger.info('    %s: trigger divider: %d  save image divider: %d' +
+                        '  save frame divider: %d', sc.camera_name, sc.trigger_divider,
+                        sc.save_stills_divider, sc.save_video_divider)
 
                 #  set up triggering
-                if config['trigger_source'].lower() == 'hardware':
+                if cfg.trigger_source.lower() == 'hardware':
                     #  set up the camera to use hardware triggering
                     sc.set_camera_trigger('Hardware')
-                    self.logger.info('    %s: Hardware triggering enabled.' % (sc.camera_name))
+                    self.logger.info('    %s: Hardware triggering enabled.', sc.camera_name)
 
                     #  if any cameras are hardware triggered we set hwTriggered to True
                     self.hwTriggered = True
@@ -922,60 +1399,64 @@ class AcquisitionBase(QtCore.QObject):
                 else:
                     #  set up the camera for software triggering
                     sc.set_camera_trigger('Software')
-                    self.logger.info('    %s: Software triggering enabled.' % (sc.camera_name))
+                    self.logger.info('    %s: Software triggering enabled.', sc.camera_name)
 
                 # This should probably be set on the camera to ensure the line is inverted
                 # when the camera starts up.
                 #ok = sc.set_strobe_trigger(1)
 
                 #  set the camera exposure, gain, and rotation
-                if this_exposure:
-                    sc.set_exposure(this_exposure)
-                sc.set_gain(config['gain'])
-                sc.rotation = config['rotation']
-                self.logger.info('    %s: label: %s  gain: %d  exposure_us: %d  rotation:%s' %
-                        (sc.camera_name, config['label'], sc.get_gain(), sc.get_exposure(),
-                        config['rotation']))
+                #  The drivers store the applied (clamped) manual values so we only need
+                #  to query the camera when a setting is automatic or failed to apply.
+                if this_exposure and sc.set_exposure(this_exposure) and this_exposure > 0:
+                    exposure = sc.exposure
+                else:
+                    exposure = sc.get_exposure()
+                if sc.set_gain(cfg.gain) and cfg.gain > 0:
+                    gain = sc.gain
+                else:
+                    gain = sc.get_gain()
+                sc.rotation = cfg.rotation
+                self.logger.info('    %s: label: %s  gain: %d  exposure_us: %d  rotation:%s',
+                        sc.camera_name, cfg.label, gain, exposure, cfg.rotation)
 
                 #  set the sensor binning
-                sc.set_binning(config['sensor_binning'])
+                sc.set_binning(cfg.sensor_binning)
                 binning = sc.get_binning()
-                self.logger.info('    %s: Sensor binning set to %i x %i' %
-                        (sc.camera_name, binning, binning))
+                self.logger.info('    %s: Sensor binning set to %i x %i',
+                        sc.camera_name, binning, binning)
 
                 #  set up HDR if configured
-                if config['hdr_enabled']:
+                if cfg.hdr_enabled:
                     ok = sc.enable_hdr_mode()
                     if ok:
-                        self.logger.info('    %s: Enabling HDR: OK' % (sc.camera_name))
-                        if config['hdr_settings'] is not None:
-                            self.logger.info('    %s: Setting HDR Params: %s' % (sc.camera_name,
-                                    config['hdr_settings']))
-                            sc.set_hdr_settings(config['hdr_settings'])
+                        self.logger.info('    %s: Enabling HDR: OK', sc.camera_name)
+                        if cfg.hdr_settings is not None:
+                            self.logger.info('    %s: Setting HDR Params: %s', sc.camera_name,
+                                    cfg.hdr_settings)
+                            sc.set_hdr_settings(cfg.hdr_settings)
                         else:
-                            self.logger.info('    %s: HDR Params not provided. Using values from camera.' %
-                                    (sc.camera_name))
+                            self.logger.info('    %s: HDR Params not provided. Using values from camera.',
+                                    sc.camera_name)
 
-                        sc.hdr_save_merged = config['hdr_save_merged']
-                        sc.hdr_signal_merged = config['hdr_signal_merged']
-                        sc.hdr_merge_method = config['hdr_merge_method']
-                        sc.hdr_tonemap_saturation = config['hdr_tonemap_saturation']
-                        sc.hdr_tonemap_bias = config['hdr_tonemap_bias']
-                        sc.hdr_tonemap_gamma = config['hdr_tonemap_gamma']
+                        sc.hdr_save_merged = cfg.hdr_save_merged
+                        sc.hdr_signal_merged = cfg.hdr_signal_merged
+                        sc.hdr_merge_method = cfg.hdr_merge_method
+                        sc.hdr_tonemap_saturation = cfg.hdr_tonemap_saturation
+                        sc.hdr_tonemap_bias = cfg.hdr_tonemap_bias
+                        sc.hdr_tonemap_gamma = cfg.hdr_tonemap_gamma
 
                         #  check if there is a camera response file to load
-                        if config['hdr_response_file'] in ['none', 'None', 'NONE']:
-                            config['hdr_response_file'] = None
-                        if config['hdr_response_file'] is not None:
+                        if cfg.hdr_response_file is not None:
                             try:
-                                sc.load_hdr_reponse(config['hdr_response_file'])
-                                self.logger.info('    %s: Loaded HDR response file: %s' %
-                                        (sc.camera_name, config['hdr_response_file']))
-                            except:
-                                self.logger.error('    %s: Failed to load HDR response file: %s' %
-                                        (sc.camera_name, config['hdr_response_file']))
+                                sc.load_hdr_response(cfg.hdr_response_file)
+                                self.logger.info('    %s: Loaded HDR response file: %s',
+                                        sc.camera_name, cfg.hdr_response_file)
+                            except (OSError, ValueError, NotImplementedError):
+                                self.logger.exception('    %s: Failed to load HDR response file: %s',
+                                        sc.camera_name, cfg.hdr_response_file)
                     else:
-                        self.logger.error('    %s: Failed to enable HDR.' % (sc.camera_name))
+                        self.logger.error('    %s: Failed to enable HDR.', sc.camera_name)
                 else:
                     sc.disable_hdr_mode()
 
@@ -986,16 +1467,19 @@ class AcquisitionBase(QtCore.QObject):
                 #  move the camera to that thread
                 sc.moveToThread(thread)
 
-                #  connect up our signals
-                sc.imageData.connect(self.CamImageAcquired)
-                sc.triggerComplete.connect(self.CamTriggerComplete)
-                sc.error.connect(self.LogCamError)
-                sc.acquisitionStarted.connect(self.AcquisitionStarted)
-                sc.acquisitionStopped.connect(self.AcquisitionStopped)
-                sc.videoSaved.connect(self.LogVideoMetadata)
-                self.trigger.connect(sc.trigger)
-                self.stopAcquiring.connect(sc.stop_acquisition)
-                self.startAcquiring.connect(sc.start_acquisition)
+                #  connect up our signals. The camera lives in its own thread so the
+                #  connections are always queued. We state this explicitly so Qt doesn't
+                #  have to resolve the connection type each time a signal is emitted.
+                queued = QtCore.Qt.QueuedConnection
+                sc.imageData.connect(self.CamImageAcquired, queued)
+                sc.triggerComplete.connect(self.CamTriggerComplete, queued)
+                sc.error.connect(self.LogCamError, queued)
+                sc.acquisitionStarted.connect(self.AcquisitionStarted, queued)
+                sc.acquisitionStopped.connect(self.AcquisitionStopped, queued)
+                sc.videoSaved.connect(self.LogVideoMetadata, queued)
+                self.trigger.connect(sc.trigger_event, queued)
+                self.stopAcquiring.connect(sc.stop_acquisition, queued)
+                self.startAcquiring.connect(sc.start_acquisition, queued)
 
                 #  these signals handle the cleanup when we're done
                 sc.acquisitionStopped.connect(thread.quit)
@@ -1010,42 +1494,47 @@ class AcquisitionBase(QtCore.QObject):
                 self.cameras[sc.camera_name] = sc
                 self.received[sc.camera_name] = False
 
-                if config['save_stills']:
-                    if image_options['file_ext'].lower() in ['.jpeg','.jpg']:
-                        self.logger.info('    %s: Saving stills as %s  Scale: %i  Quality: %i' % (sc.camera_name,
-                            image_options['file_ext'], image_options['scale'],image_options['jpeg_quality']))
+                #  and store this camera's final configuration
+                self.camera_params[sc.camera_name] = cfg
+
+                if cfg.save_stills:
+                    if image_options['file_ext'].lower() in self._JPEG_EXTENSIONS:
+                        self.logger.info('    %s: Saving stills as %s  Scale: %i  Quality: %i', sc.camera_name,
+                            image_options['file_ext'], image_options['scale'], image_options['jpeg_quality'])
                     else:
-                        self.logger.info('    %s: Saving stills as %s  Scale: %i' % (sc.camera_name,
-                            image_options['file_ext'], image_options['scale']))
+                        self.logger.info('    %s: Saving stills as %s  Scale: %i', sc.camera_name,
+                            image_options['file_ext'], image_options['scale'])
 
                     if self.use_db:
                         #  update the deployment_data table with the image file type
-                        self.db.set_image_extension(image_options['file_ext'])
+                        self.dbWrite.emit('set_image_extension', (image_options['file_ext'],))
 
-                if config['save_video']:
-                    self.logger.info('    %s: Saving video as %s  Video profile: %s' % (sc.camera_name,
-                            video_profile['file_ext'], config['video_preset']))
+                if cfg.save_video:
+                    self.logger.info('    %s: Saving video as %s  Video profile: %s', sc.camera_name,
+                            video_profile['file_ext'], cfg.video_preset)
                     if self.use_db:
                         #  update the deployment_data table with the video file type
-                        self.db.set_video_extension(video_profile['file_ext'])
+                        self.dbWrite.emit('set_video_extension', (video_profile['file_ext'],))
 
                 #  issue a warning if a camera is not saving any image data
-                if config['save_video'] or config['save_stills']:
-                    self.logger.info('    %s: Image data will be written to: %s' % (sc.camera_name,
-                                self.image_dir + os.sep + sc.camera_name))
+                if cfg.save_video or cfg.save_stills:
+                    self.logger.info('    %s: Image data will be written to: %s', sc.camera_name,
+                                self.image_dir / sc.camera_name)
                 else:
-                    self.logger.warning('    %s: WARNING: Both video and still saving is disabled. ' %
-                            (sc.camera_name) + 'NO IMAGE DATA WILL BE RECORDED')
+                    self.logger.warning('    %s: WARNING: Both video and still saving is disabled. ' +
+                            'NO IMAGE DATA WILL BE RECORDED', sc.camera_name)
 
                 #  emit the startAcquiring signal to start the cameras
-                self.startAcquiring.emit([sc], self.image_dir, config['save_stills'],
-                        image_options, config['save_video'], video_profile)
+                self.startAcquiring.emit([sc], str(self.image_dir), cfg.save_stills,
+                        image_options, cfg.save_video, video_profile)
 
             else:
                 #  There is no default section and no camera specific section
                 #  so we skip this camera
-                self.logger.info("  Skipped camera: " + cam +
-                        ". No configuration entry found.")
+                self.logger.info("  Skipped camera: %s. No configuration entry found.", cam)
+
+        #  cache the camera names used to reset the received state when triggering
+        self._camera_names = tuple(self.cameras)
 
         #  we're done with setup
         self.logger.info("Camera setup complete.")
@@ -1057,10 +1546,28 @@ class AcquisitionBase(QtCore.QObject):
             return False
 
 
+    def StartTriggerTimer(self, delay_ms):
+        '''StartTriggerTimer starts the trigger timer to trigger the cameras after
+        the specified delay in ms.
+        '''
+        self._trigger_timer_phase = self.TRIGGER_PHASE
+        self._trigger_timer_start(delay_ms)
+
+
     @QtCore.pyqtSlot()
+    def TriggerTimerExpired(self):
+        '''The TriggerTimerExpired slot is called when the trigger timer expires. It
+        calls TriggerCameras or TriggerTimeout depending on the timer's phase.
+        '''
+        if self._trigger_timer_phase == self.TRIGGER_PHASE:
+            self.TriggerCameras()
+        else:
+            self.TriggerTimeout()
+
+
     def TriggerTimeout(self):
         '''
-        The TriggerTimeout slot is called by the trigger timeout timer. This
+        TriggerTimeout is called when the trigger timer expires in the timeout phase. This
         method simply calls the TriggerCameras method again in a heroic attempt
         to keep acquiring data after an unhandled issue causes acquisition to
         stall.
@@ -1070,10 +1577,33 @@ class AcquisitionBase(QtCore.QObject):
         self.logger.warning("WARNING: Trigger timeout. One or more cameras failed " +
                 "to respond after being triggered.")
 
+        #  write the images we did receive for the timed out trigger. Images are
+        #  normally written when all of the cameras complete the trigger which
+        #  won't happen if a camera has stopped responding.
+        if self._pending_images:
+            self.dbWrite.emit('add_images', (self._pending_images,))
+            self._pending_images = []
+
+        #  the timed out trigger counts toward the commit interval so the transaction
+        #  isn't held open indefinitely when a camera stops responding
+        if self.use_db:
+            self.CommitTrigger()
+
         #  and try triggering again.
         self.TriggerCameras()
 
 
+    def CommitTrigger(self):
+        '''
+        CommitTrigger is called when a trigger has completed or timed out. It commits
+        the database transaction every commit_every_n_triggers triggers.
+        '''
+        self.triggers_since_commit += 1
+        if self.triggers_since_commit >= self._commit_every_n_triggers:
+            self.dbWrite.emit('commit', ())
+            self.triggers_since_commit = 0
+
+
     @QtCore.pyqtSlot()
     def TriggerCameras(self):
         '''
@@ -1092,8 +1622,8 @@ class AcquisitionBase(QtCore.QObject):
         '''
 
         #  reset the received image state for *all* cameras
-        for cam_name in self.cameras:
-            self.received[cam_name] = False
+        self.received = dict.fromkeys(self._camera_names, False)
+        self._pending_cameras = len(self._camera_names)
 
         #  reset the per trigger save image/frame state
         self.saved_last_still = False
@@ -1101,13 +1631,21 @@ class AcquisitionBase(QtCore.QObject):
 
         #  note the trigger time
         self.trig_time = datetime.datetime.now()
+        self.trig_mono_ns = time.monotonic_ns()
+        self.trig_mono = self.trig_mono_ns / 1e9
+
+        #  group the database inserts into a single transaction. A new transaction is
+        #  only started after the previous one was committed in CommitTrigger.
+        if self.use_db and self.triggers_since_commit == 0:
+            self.dbWrite.emit('begin_transaction', ())
 
         #  start the trigger timeout timer. This timer ensures that if acquisition
         #  stalls for some unhandled reason, we'll keep trying.
-        self.timeoutTimer.start(self.ACQUISITION_TIMEOUT)
+        self._trigger_timer_phase = self.TIMEOUT_PHASE
+        self._trigger_timer_start(self.ACQUISITION_TIMEOUT)
 
         #  emit the trigger signal to trigger the cameras
-        self.trigger.emit([], self.n_images, self.trig_time, True, True)
+        self._trigger_emit(TriggerEvent([], self.n_images, self.trig_time, True, True))
 
         # TODO: Currently we only write a single entry in the sensor_data table for
         #       HDR acquisition sequences because we're not incrementing the image
@@ -1119,24 +1657,22 @@ class AcquisitionBase(QtCore.QObject):
 
         #  and write synced sensor data  to the db
         if self.use_db:
-            self.sync_trigger_messages = []
-            for sensor_id in self.syncdSensorData:
-                for header in self.syncdSensorData[sensor_id]:
-                    #  check if the data is fresh
-                    freshness = self.trig_time - self.syncdSensorData[sensor_id][header]['time']
-                    if ((self.configuration['sensors']['synchronous_timeout_secs'] < 0) or
-                        (abs(freshness.total_seconds()) <= self.configuration['sensors']['synchronous_timeout_secs'])):
-                        #  it is fresh enough. Write it to the db - in order to selectively write sync
-                        #  data based on still/video frame and implement sync data dividers as a method
-                        #  for reducing data volume, we store the sync values here and then write them
-                        #  in CamTriggerComplete where we know what was saved.
-                        self.sync_trigger_messages.append([self.n_images, self.syncdSensorData[sensor_id][header]['time'],
-                                sensor_id, header, self.syncdSensorData[sensor_id][header]['data']])
-                        #self.db.insert_sync_data(self.n_images, self.syncdSensorData[sensor_id][header]['time'],
-                        #        sensor_id, header, self.syncdSensorData[sensor_id][header]['data'])
-
-
-    @QtCore.pyqtSlot(str, str, dict)
+            sync_timeout = self._synchronous_timeout_secs
+            no_timeout = sync_timeout < 0
+            n_images = self.n_images
+            trig_mono = self.trig_mono
+            #  collect the data that are fresh enough to write to the db - in order to
+            #  selectively write sync data based on still/video frame and implement sync
+            #  data dividers as a method for reducing data volume, we store the sync
+            #  values here and then write them in CamTriggerComplete where we know what
+            #  was saved. The list is handed to the database writer thread, so a new one
+            #  is created for each trigger.
+            self.sync_trigger_messages = [(n_images, rx_time, sensor_id, header, data)
+                    for (sensor_id, header), (rx_time, data, mono) in self.syncdSensorData.items()
+                    if no_timeout or abs(trig_mono - mono) <= sync_timeout]
+
+
+    @QtCore.pyqtSlot(str, str, object)
     def CamImageAcquired(self, cam_name, cam_label, image_data):
         '''CamImageAcquired is called when a camera has acquired an image
         or timed out waiting for one.
@@ -1146,40 +1682,37 @@ class AcquisitionBase(QtCore.QObject):
         '''
 
         #  Check if we received an image or not
-        if  not image_data['ok']:
+        if not image_data['ok']:
             #  no image data
-            log_str = (cam_name + ': FAILED TO ACQUIRE IMAGE')
+            self.logger.debug('%s: FAILED TO ACQUIRE IMAGE', cam_name)
             if self.use_db:
-                self.db.add_dropped(self.n_images, cam_name, self.trig_time)
+                self.dbWrite.emit('add_dropped', (self.n_images, cam_name, self.trig_time))
         else:
             #  we do have image data - check if we should log this image to the images table
+            save_still = image_data['save_still']
+            save_frame = image_data['save_frame']
+            exposure = image_data['exposure']
+            gain = image_data['gain']
 
             #  Only store the image file name, no path info
-            filename = Path(image_data['filename']).name
-
-            #  note if we have saved a still or video frame for this trigger cycle.
-            if image_data['save_still']:
-                if not self.saved_last_still:
-                    self.saved_last_still = True
-                    self.n_saved_stills += 1
-            if image_data['save_frame']:
-                if not self.saved_last_frame:
-                    self.saved_last_frame = True
-                    self.n_saved_frames += 1
+            filename = os.path.basename(image_data['filename'])
 
-            if self.use_db:
-                #  only write an entry in the images table if we have saved a still or
-                #  if we saved a video frame and video_log_frames == True
-                if (image_data['save_still'] or (self.configuration['acquisition']['video_log_frames'] and
-                        image_data['save_frame'])):
-                    self.db.add_image(self.n_images, cam_name, self.trig_time, filename,
-                            image_data['exposure'], image_data['gain'], image_data['save_still'],
-                            image_data['save_frame'])
+            #  note if we have saved a still or video frame for this trigger cycle. The
+            #  counters are only incremented by the first camera that saves this cycle.
+            self.n_saved_stills += bool(save_still and not self.saved_last_still)
+            self.saved_last_still = self.saved_last_still or bool(save_still)
+            self.n_saved_frames += bool(save_frame and not self.saved_last_frame)
+            self.saved_last_frame = self.saved_last_frame or bool(save_frame)
+
+            #  only write an entry in the images table if we have saved a still or
+            #  if we saved a video frame and video_log_frames == True
+            if self.use_db and (save_still or (self._video_log_frames and save_frame)):
+                #  images are written in a batch when the trigger completes
+                self._pending_images.append((self.n_images, cam_name, self.trig_time, filename,
+                        exposure, gain, save_still, save_frame))
 
-            log_str = (cam_name + ': Image Acquired: %dx%d  exp: %d  gain: %2.1f  filename: %s' %
-                    (image_data['width'], image_data['height'], image_data['exposure'],
-                    image_data['gain'], filename))
-        self.logger.debug(log_str)
+            self.logger.debug('%s: Image Acquired: %dx%d  exp: %d  gain: %2.1f  filename: %s',
+                    cam_name, image_data['width'], image_data['height'], exposure, gain, filename)
 
 
     @QtCore.pyqtSlot(object, bool)
@@ -1190,67 +1723,78 @@ class AcquisitionBase(QtCore.QObject):
         '''
 
         #  note that this camera has completed the trigger event
-        self.received[cam_obj.camera_name] = True
+        all_received = self.SetCameraReceived(cam_obj.camera_name)
 
         #  emit some debugging info
         if triggered:
-            self.logger.debug(cam_obj.camera_name + ': Trigger Complete.')
+            self.logger.debug('%s: Trigger Complete.', cam_obj.camera_name)
 
         #  check if all triggered cameras have completed the trigger sequence
-        if (all(self.received.values())):
+        if all_received:
 
             #  they have - check if we should write synced sensor data to the db
             if self.use_db:
                 write_sync = False
                 #  check if we saved this still and the total number of saved stills is evenly
                 #  divisible by the still_sync_data_divider
-                if ((self.n_saved_stills % self.configuration['acquisition']['still_sync_data_divider']) == 0 and
+                if ((self.n_saved_stills % self._still_sync_data_divider) == 0 and
                         self.saved_last_still):
                     #  it is, so we'll write the data
                     write_sync = True
                 #  if not, then we check for the same thing with the video frames
-                elif ((self.n_saved_frames % self.configuration['acquisition']['video_sync_data_divider']) == 0 and
+                elif ((self.n_saved_frames % self._video_sync_data_divider) == 0 and
                         self.saved_last_frame):
                     write_sync = True
-                if write_sync:
+                #  write the images acquired during this trigger
+                self.dbWrite.emit('add_images', (self._pending_images,))
+                self._pending_images = []
+                if write_sync and self.sync_trigger_messages:
                     #  write all of the sync messages we cached when the cameras were triggered.
-                    for message_data in self.sync_trigger_messages:
-                            self.db.insert_sync_data(message_data[0],message_data[1],message_data[2],
-                                    message_data[3],message_data[4])
+                    self.dbWrite.emit('insert_sync_data_batch', (self.sync_trigger_messages,))
+                #  the cached messages belong to this trigger only
+                self.sync_trigger_messages = []
+
+                #  commit the trigger transaction every commit_every_n_triggers triggers
+                self.CommitTrigger()
 
             #  Increment our counters
             self.n_images += 1
             self.this_images += 1
 
-            #  cancel our timeout timer
-            self.timeoutTimer.stop()
+            #  cancel our timeout timer. If we're still triggering it is restarted
+            #  for the next trigger below.
+            self.triggerTimer.stop()
 
             #  check if we're configured for a limited number of triggers
-            if ((self.configuration['acquisition']['trigger_limit'] > 0) and
-                (self.this_images > self.configuration['acquisition']['trigger_limit'])):
+            if ((self._trigger_limit > 0) and
+                (self.this_images > self._trigger_limit)):
 
-                    self.logger.info("Trigger limit of %i triggers reached. Shutting down..." %
-                            (self.this_images-1))
+                    self.logger.info("Trigger limit of %i triggers reached. Shutting down...",
+                            self.this_images - 1)
 
                     #  time to stop acquiring - call our StopAcquisition method and set
                     #  exit_app to True to exit the application after the cameras stop.
                     self.StopAcquisition(exit_app=True,
-                            shutdown_on_exit=self.configuration['application']['shut_down_on_exit'])
+                            shutdown_on_exit=self._shut_down_on_exit)
             else:
-                #  keep going - determine elapsed time and set the trigger for the next interval
-                elapsed_time_ms = (datetime.datetime.now() - self.trig_time).total_seconds() * 1000
-                acq_interval_ms = 1000.0 / self.configuration['acquisition']['trigger_rate']
-                next_int_time_ms = int(acq_interval_ms - elapsed_time_ms)
-                if next_int_time_ms < 0:
-                    next_int_time_ms = 0
-
-                self.logger.debug("Trigger %d completed. Last interval %8.4f ms" %
-                        (self.this_images, elapsed_time_ms))
+                #  keep going - schedule the next trigger one interval after this trigger's
+                #  deadline (not after when it actually fired) so the trigger rate doesn't
+                #  drift. If this trigger fired more than an interval late (the first trigger
+                #  or after triggering was paused) we start the schedule over from this trigger.
+                now_ns = time.monotonic_ns()
+                elapsed_time_ms = (now_ns - self.trig_mono_ns) / 1e6
+                self._trigger_deadline_ns += self._trigger_interval_ns
+                if self._trigger_deadline_ns < self.trig_mono_ns:
+                    self._trigger_deadline_ns = self.trig_mono_ns + self._trigger_interval_ns
+                next_int_time_ms = max(0, (self._trigger_deadline_ns - now_ns) // 1000000)
+
+                self.logger.debug("Trigger %d completed. Last interval %8.4f ms",
+                        self.this_images, elapsed_time_ms)
 
                 #  start the next trigger timer
                 if self.isTriggering:
-                    self.logger.debug("Next trigger in  %8.4f ms." % (next_int_time_ms))
-                    self.triggerTimer.start(next_int_time_ms)
+                    self.logger.debug("Next trigger in  %8.4f ms.", next_int_time_ms)
+                    self.StartTriggerTimer(next_int_time_ms)
 
 
     @QtCore.pyqtSlot(str, str)
@@ -1260,7 +1804,7 @@ class AcquisitionBase(QtCore.QObject):
         we just log the error and move on.
         '''
         #  log it.
-        self.logger.error(cam_name + ':ERROR:' + error_str)
+        self.logger.error('%s:ERROR:%s', cam_name, error_str)
 
 
     @QtCore.pyqtSlot(str, str, int, int, datetime.datetime, datetime.datetime)
@@ -1271,9 +1815,42 @@ class AcquisitionBase(QtCore.QObject):
         for each video file.
         '''
 
-        self.logger.debug(cam_name + ':ImageWriter:' + filename + ' start frame:' +
-                str(start_frame) + ' end frame:' + str(end_frame))
-        self.db.add_video(cam_name, filename, start_frame, end_frame, start_time, end_time)
+        self.logger.debug('%s:ImageWriter:%s start frame:%d end frame:%d', cam_name, filename,
+                start_frame, end_frame)
+        if self.use_db:
+            self.dbWrite.emit('add_video', (cam_name, filename, start_frame, end_frame,
+                    start_time, end_time))
+
+
+    def StartDatabaseWriter(self):
+        '''StartDatabaseWriter closes the database connection used during setup and
+        starts the DatabaseWriter thread which reopens the database file. All database
+        writes after this are sent to the writer using the dbWrite signal so SQLite I/O
+        doesn't block our event loop.
+        '''
+        db_file = self.db.db_file
+        self.db.close()
+
+        self.dbWriter = DatabaseWriter.DatabaseWriter(db_file)
+        self.dbWriterThread = QtCore.QThread(self)
+        self.dbWriter.moveToThread(self.dbWriterThread)
+        self.dbWrite.connect(self.dbWriter.write, QtCore.Qt.QueuedConnection)
+        self.dbWriter.error.connect(self.LogDatabaseError, QtCore.Qt.QueuedConnection)
+        self.stopDbWriter.connect(self.dbWriter.stopWriter, QtCore.Qt.QueuedConnection)
+        self.dbWriterThread.started.connect(self.dbWriter.startWriter)
+        #  QThread.quit is thread safe. Call it directly so the thread exits as soon as
+        #  the writer has closed the database.
+        self.dbWriter.writerStopped.connect(self.dbWriterThread.quit, QtCore.Qt.DirectConnection)
+        self.dbWriterThread.finished.connect(self.DatabaseWriterStopped, QtCore.Qt.QueuedConnection)
+        self.dbWriterThread.start()
+
+
+    @QtCore.pyqtSlot(str)
+    def LogDatabaseError(self, error_str):
+        '''
+        The LogDatabaseError slot is called when the DatabaseWriter runs into an error.
+        '''
+        self.logger.error('DatabaseWriter:ERROR:%s', error_str)
 
 
     @QtCore.pyqtSlot(str)
@@ -1283,7 +1860,7 @@ class AcquisitionBase(QtCore.QObject):
         For now we just log the error and move on.
         '''
         #  log it.
-        self.logger.error('CamtrawlServer:ERROR:' + error_str)
+        self.logger.error('CamtrawlServer:ERROR:%s', error_str)
 
 
     @QtCore.pyqtSlot(object, str, bool)
@@ -1293,12 +1870,25 @@ class AcquisitionBase(QtCore.QObject):
         startAcquiring signal.
         '''
         if success:
-            self.logger.info(cam_name + ': acquisition started.')
+            self.logger.info('%s: acquisition started.', cam_name)
         else:
-            self.logger.error(cam_name + ': unable to start acquisition.')
+            self.logger.error('%s: unable to start acquisition.', cam_name)
             #  NEED TO CLOSE THIS CAMERA?
 
 
+    def SetCameraReceived(self, cam_name):
+        '''SetCameraReceived marks a camera as having responded in the received dict
+        and returns True when all cameras have responded. A count of the cameras we're
+        still waiting on is kept so we don't have to check every camera each time.
+        Marking a camera more than once has no effect.
+        '''
+        if self.received.get(cam_name) is False:
+            self.received[cam_name] = True
+            self._pending_cameras -= 1
+
+        return self._pending_cameras <= 0
+
+
     @QtCore.pyqtSlot(object, str, bool)
     def AcquisitionStopped(self, cam_obj, cam_name, success):
         '''
@@ -1308,15 +1898,13 @@ class AcquisitionBase(QtCore.QObject):
         '''
 
         if success:
-            self.logger.info(cam_name + ': acquisition stopped.')
+            self.logger.info('%s: acquisition stopped.', cam_name)
         else:
-            self.logger.error(cam_name + ': unable to stop acquisition.')
-
-        #  update the received dict noting this camera has stopped
-        self.received[cam_obj.camera_name] = True
+            self.logger.error('%s: unable to stop acquisition.', cam_name)
 
+        #  update the received dict noting this camera has stopped and
         #  check if all cameras have stopped
-        if (all(self.received.values())):
+        if self.SetCameraReceived(cam_obj.camera_name):
             self.logger.info('All cameras stopped.')
 
             #  if we're supposed to exit the application, do it
@@ -1335,16 +1923,15 @@ class AcquisitionBase(QtCore.QObject):
         have responded to the stopAcquiring signal.
         '''
 
-        #  stop the trigger and timeout timers
+        #  stop the trigger timer
         self.isTriggering = False
         self.triggerTimer.stop()
-        self.timeoutTimer.stop()
 
         #  use the received dict to track the camera shutdown. When all
         #  cameras are True, we know all of them have reported that they
         #  have stopped recording.
-        for cam_name in self.cameras:
-            self.received[cam_name] = False
+        self.received = dict.fromkeys(self.cameras, False)
+        self._pending_cameras = len(self.received)
 
         #  set the exit and shutdown states
         self.isExiting = bool(exit_app)
@@ -1380,33 +1967,57 @@ class AcquisitionBase(QtCore.QObject):
             self.serial_threads_finished = True
 
         #  if we're using the database, close it
-        if self.use_db and self.db.is_open:
+        if self.dbWriterThread is not None and not self.db_writer_stopped:
             self.logger.info("Closing the database...")
+            #  write any images from an incomplete trigger
+            self.dbWrite.emit('add_images', (self._pending_images,))
+            self._pending_images = []
+            #  and any buffered async sensor data
+            self.FlushAsyncData()
             end_time = datetime.datetime.now()
-            self.db.update_deployment_endtime(end_time)
-            self.db.close()
+            self.dbWrite.emit('update_deployment_endtime', (end_time,))
+            #  the writer closes the database after it has processed the queued writes.
+            #  Async sensor data received from here on is ignored and teardown continues
+            #  when the writer thread has finished.
+            self.db_writer_stopped = True
+            self.db_writer_finished = False
+            self.stopDbWriter.emit()
+
+        #  stop the disk monitor thread
+        if self.diskMonitorThread is not None:
+            self.stopDiskMonitor.emit()
+            self.diskMonitorThread.wait(1000)
 
         #  same with the server
         if self.configuration['server']['start_server']:
             self.logger.info("Shutting down the server...")
             self.server_finished = False
             self.stopServer.emit()
+        else:
+            self.server_finished = True
 
         #  we need to make sure we release all references to our SpinCamera
         #  objects so Spinnaker can clean up behind the scenes.
         self.logger.debug("Cleaning up references to Spinnaker objects...")
         self.received = {}
+        self._pending_cameras = 0
         self.hw_triggered_cameras = []
         self.cameras = {}
+        self._camera_names = ()
+        self.camera_params = {}
         self.enumerated_cameras = []
+        self._enumerated_set = set()
         self.spin_cameras = {}
 
-        #  now we'll wait a bit to allow the serial ports and server to finish closing.
-        self.acqisition_teardown_tries = 0
-        delayTimer = QtCore.QTimer(self)
-        delayTimer.timeout.connect(self.AcqisitionTeardownTimeout)
-        delayTimer.setSingleShot(True)
-        delayTimer.start(500)
+        #  now we wait for the serial ports, database writer, and server to finish closing.
+        #  Teardown continues in CheckTeardownReady when they have, or in
+        #  AcqisitionTeardownTimeout if they don't finish in time.
+        self.teardownTimer = QtCore.QTimer(self)
+        self.teardownTimer.timeout.connect(self.AcqisitionTeardownTimeout)
+        self.teardownTimer.setSingleShot(True)
+        self.teardownTimer.setTimerType(QtCore.Qt.VeryCoarseTimer)
+        self.teardownTimer.start(self.TEARDOWN_TIMEOUT_MS)
+        self.CheckTeardownReady()
 
 
     @QtCore.pyqtSlot()
@@ -1415,40 +2026,55 @@ class AcquisitionBase(QtCore.QObject):
         '''
         self.logger.info("CamtrawlServer stopped.")
         self.server_finished = True
+        self.CheckTeardownReady()
 
 
     @QtCore.pyqtSlot()
-    def AcqisitionTeardownTimeout(self):
-        '''AcqisitionTeardownTimeout is called periodically after the initial teardown
-        steps have been executed. Here we check if these initial steps have completed.
-        When those steps have completed, we continue teardown in
+    def DatabaseWriterStopped(self):
+        '''The DatabaseWriterStopped slot is called when the DatabaseWriter thread has
+        finished after committing and closing the database.
+        '''
+        self.logger.info("Database closed.")
+        self.db_writer_finished = True
+        self.CheckTeardownReady()
 
+
+    def CheckTeardownReady(self):
+        '''CheckTeardownReady is called when the serial sensors, the database writer, or
+        the server have finished closing during teardown. When all have finished we
+        continue teardown in AcqisitionTeardown2.
         '''
-        #  keep track of how long were waiting so we can bail if
-        self.acqisition_teardown_tries += 1
+        #  the teardown timer is only active while we're waiting to continue teardown
+        if self.teardownTimer is None or not self.teardownTimer.isActive():
+            return
 
-        #  create a timer
-        delayTimer = QtCore.QTimer(self)
-        delayTimer.setSingleShot(True)
+        if self.server_finished and self.serial_threads_finished and self.db_writer_finished:
+            self.teardownTimer.stop()
+            #  continue from the event loop so pending thread and object cleanup
+            #  events are processed first
+            QtCore.QTimer.singleShot(0, self.AcqisitionTeardown2)
 
-        #  check if we're ready to continue teardown
-        if (self.acqisition_teardown_tries >= self.TEARDOWN_TRIES or
-                self.server_finished and self.serial_threads_finished):
-            #  either everything we're tracking has shut down or we're bailing
-            delayTimer.timeout.connect(self.AcqisitionTeardown2)
-        else:
-            #  we're not ready to proceed - so we'll set the timer to call
-            delayTimer.timeout.connect(self.AcqisitionTeardownTimeout)
 
-        #  start the timer
-        delayTimer.start(500)
+    @QtCore.pyqtSlot()
+    def AcqisitionTeardownTimeout(self):
+        '''AcqisitionTeardownTimeout is called if the serial sensors, database writer, and
+        server have not finished closing within TEARDOWN_TIMEOUT_MS. We log it and
+        continue teardown.
+        '''
+        self.logger.warning("Timed out waiting for the serial sensors, database, and server " +
+                "to close.")
+        if not self.db_writer_finished:
+            self.logger.error("The database writer did not finish. The most recent metadata " +
+                    "may not have been written to the database.")
+        self.AcqisitionTeardown2()
 
 
     def AcqisitionTeardown2(self):
         '''
         AcqisitionTeardown2 is called to finish teardown. This last bit of cleanup
-        is triggered by a delay timer to give threads and the Python GC a little time
-        to finish cleaning up before we release the spinnaker instance and shut down.
+        is run from the event loop after the serial and server threads have finished
+        to give threads and the Python GC a chance to finish cleaning up before we
+        release the spinnaker instance and shut down.
         '''
 
         # Now we can release the Spinnaker system instance
@@ -1479,9 +2105,13 @@ class AcquisitionBase(QtCore.QObject):
                 #  add these lines to your /etc/sudoers file:
                 #    camtrawl ALL=NOPASSWD: /camtrawl/software/scripts/delay_shutdown.sh
                 #    camtrawl ALL=NOPASSWD: /sbin/shutdown.sh
+                #
+                #  The script is started in a new session so it isn't killed when we
+                #  exit. start_new_session is used instead of a preexec_fn so subprocess
+                #  can use vfork rather than fork and copy our page tables.
                 subprocess.Popen(['sudo', '/camtrawl/software/scripts/delay_shutdown.sh'],
                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
-                        preexec_fn=os.setpgrp)
+                        start_new_session=True)
 
         self.logger.info("Acquisition Stopped.")
         self.logger.info("Application exiting...")
@@ -1504,19 +2134,19 @@ class AcquisitionBase(QtCore.QObject):
         add_camera = False
 
         #  start with the default camera configuration
-        config = AcquisitionBase.CAMERA_CONFIG_OPTIONS.copy()
+        config = dict(AcquisitionBase.CAMERA_CONFIG_OPTIONS)
 
         # Look for a camera specific entry first
         if camera_name in self.configuration['cameras']:
             #  update this camera's config with the camera specific settings
-            config = self.__update(config, self.configuration['cameras'][camera_name])
+            self.__update(config, self.configuration['cameras'][camera_name])
             #  we add cameras that are explicitly configured in the config file
             add_camera = True
 
         # If that fails, check for a default section
-        elif 'default' in self.configuration['cameras']:
-            #  update this camera's config with the camera specific settings
-            config = self.__update(config, self.configuration['cameras']['default'])
+        elif self.default_camera_config is not None:
+            #  update this camera's config with the default camera settings
+            self.__update(config, self.default_camera_config)
             #  we add all cameras if there is a 'default' section in the config file
             add_camera = True
 
@@ -1530,9 +2160,9 @@ class AcquisitionBase(QtCore.QObject):
         for remote viewing and control of the system.
         '''
 
-        self.logger.info("Opening Camtrawl server on  " +
-                self.configuration['server']['server_interface'] + ":" +
-                str(self.configuration['server']['server_port']))
+        self.logger.info("Opening Camtrawl server on  %s:%s",
+                self.configuration['server']['server_interface'],
+                self.configuration['server']['server_port'])
 
         #  create a dict to pass to the server keyed by camera name that
         #  contains a dicts with a 'label' key which is used by the server
@@ -1541,11 +2171,10 @@ class AcquisitionBase(QtCore.QObject):
         #  passed during init, the server will only become aware of the
         #  camera when it receives an image which gets awkward if you
         #  connect to the server before any images are acquired.
-        server_cam_dict = {}
-        for cam in self.cameras.keys():
-            server_cam_dict[cam] = {'label':self.cameras[cam].label}
+        server_cam_dict = {name:{'label':cam.label} for name, cam in self.cameras.items()}
 
         #  create an instance of CamtrawlServer
+        from CamtrawlServer import CamtrawlServer
         self.server = CamtrawlServer.CamtrawlServer(
                 self.configuration['server']['server_interface'],
                 self.configuration['server']['server_port'],
@@ -1561,7 +2190,8 @@ class AcquisitionBase(QtCore.QObject):
         self.stopServer.connect(self.server.stopServer)
 
         #  connect our signals to the server
-        self.parameterChanged.connect(self.server.parameterDataAvailable)
+        self.parameterChanged.connect(self.server.parameterDataAvailable,
+                QtCore.Qt.QueuedConnection)
 
         #  connect our cameras imageData signals to the server
         for cam_name in self.cameras:
@@ -1596,8 +2226,8 @@ class AcquisitionBase(QtCore.QObject):
         '''
 
         # Open the database file
-        dbFile = self.log_dir + os.sep + self.configuration['application']['database_name']
-        self.logger.info("Opening database file: " + dbFile)
+        dbFile = str(self.log_dir / self.configuration['application']['database_name'])
+        self.logger.info("Opening database file: %s", dbFile)
 
         if not self.db.open(dbFile):
             # If we're running in combined mode and we can't open the db file it is
@@ -1607,8 +2237,8 @@ class AcquisitionBase(QtCore.QObject):
             # cycles the original db file will still be corrupt, but this code should
             # either create or open the next non-corrupt file.
             if self.configuration['application']['output_mode'].lower() == 'combined':
-                self.logger.error('Error opening SQLite database file ' + dbFile +
-                        '. Attempting to open an alternate...')
+                self.logger.error('Error opening SQLite database file %s. Attempting to open an alternate...',
+                        dbFile)
 
                 #  to make the naming predictable we just append a number to it. MAX_DB_ALTERNATES
                 #  sets an upper bound on this process so we don't stall here forever.
@@ -1619,9 +2249,9 @@ class AcquisitionBase(QtCore.QObject):
                     dbFile = filename + '-' + str(n_try) + file_ext
 
                     #  try to open it
-                    self.logger.info("  Opening database file: " + dbFile)
+                    self.logger.info("  Opening database file: %s", dbFile)
                     if not self.db.open(dbFile):
-                        self.logger.error('  Error opening alternate database file ' + dbFile +'.')
+                        self.logger.error('  Error opening alternate database file %s.', dbFile)
                     else:
                         # success!
                         break
@@ -1638,7 +2268,7 @@ class AcquisitionBase(QtCore.QObject):
             else:
                 # When we're not running in combined mode, we will always be creating
                 # a new db file. If we cannot open a *new* file, we'll proceed as best we can.
-                self.logger.error('Error opening SQLite database file ' + dbFile +'.')
+                self.logger.error('Error opening SQLite database file %s.', dbFile)
                 self.logger.error('  Acquisition will continue without the database but ' +
                             'this situation is not ideal.')
                 self.use_db = False
@@ -1652,16 +2282,14 @@ class AcquisitionBase(QtCore.QObject):
             #  This is a failsafe for combined mode that allows us to keep acquiring
             #  images even if the metadata database gets corrupted.
             max_num = -1
-            cam_dirs = os.listdir(self.image_dir)
-            for cam_dir in cam_dirs:
-                img_files = os.listdir(self.image_dir + os.sep + cam_dir)
-                for file in img_files:
-                    try:
-                        img_num = int(file.split('_')[0])
-                        if (img_num > max_num):
-                            max_num = img_num
-                    except:
-                        pass
+            match = self._IMAGE_NUMBER_RE.match
+            with os.scandir(self.image_dir) as cam_dirs:
+                for cam_dir in cam_dirs:
+                    if not cam_dir.is_dir():
+                        continue
+                    with os.scandir(cam_dir.path) as img_files:
+                        max_num = max(max_num, max((int(m.group(1)) for m in
+                                map(match, (f.name for f in img_files)) if m), default=-1))
             if max_num < 0:
                 self.n_images = 1
             else:
@@ -1681,17 +2309,14 @@ class AcquisitionBase(QtCore.QObject):
             #  get the time
             rx_time = datetime.datetime.now()
 
-            #  check if we're prepending a header
-            if sensor_id in self.configuration['sensors']['installed_sensors']:
-                #  check if we're adding a header to this data
-                if 'add_header' in self.configuration['sensors']['installed_sensors'][sensor_id]:
-                    #  yes, add the header to the data string
-                    header = self.configuration['sensors']['installed_sensors'][sensor_id]['add_header']
-                    data = header + ',' + data
-                else:
-                    #  no, we're not adding one. Parse it from the data string
-                    data_bits = data.split(',')
-                    header = data_bits[0]
+            #  check if we're adding a header to this data
+            header = self._sensor_headers.get(sensor_id)
+            if header is not None:
+                #  yes, add the header to the data string
+                data = header + ',' + data
+            else:
+                #  no, we're not adding one. Parse it from the data string
+                header = data.partition(',')[0]
 
             #  and call SensorDataAvailable
             self.SensorDataAvailable(sensor_id, header, rx_time, data)
@@ -1704,13 +2329,82 @@ class AcquisitionBase(QtCore.QObject):
         '''
         self.logger.info("All serial ports closed.")
         self.serial_threads_finished = True
+        self.CheckTeardownReady()
 
 
     @QtCore.pyqtSlot(str, object)
     def SerialDeviceError(self, device, err):
         '''The SerialDeviceError slot is called when a sensor serial device emits an error
         '''
-        self.logger.error("ERROR: serial device '" + device + "': " + str(err))
+        self.logger.error("ERROR: serial device '%s': %s", device, err)
+
+
+    def _GetCameraListParam(self, module, parameter, params):
+        '''_GetCameraListParam emits a comma separated list of our camera names.
+        '''
+        param_value = ','.join(self._camera_names)
+        self.parameterChanged.emit(module, parameter, param_value, 1, '')
+
+
+    def _GetIsTriggeringParam(self, module, parameter, params):
+        '''_GetIsTriggeringParam emits "1" if we're currently triggering and "0" if not.
+        '''
+        self.parameterChanged.emit(module, parameter, str(int(self.isTriggering)), 1, '')
+
+
+    def _StartTriggeringParam(self, module, parameter, params, value):
+        '''_StartTriggeringParam starts triggering if we're not already.
+        '''
+        if not self.isTriggering:
+            self.isTriggering = True
+            self.StartTriggerTimer(250)
+        self.QueueParameterChange(module, 'is_triggering', str(int(self.isTriggering)))
+
+
+    def _StopTriggeringParam(self, module, parameter, params, value):
+        '''_StopTriggeringParam stops triggering.
+        '''
+        if self.isTriggering:
+            self.isTriggering = False
+        self.QueueParameterChange(module, 'is_triggering', str(int(self.isTriggering)))
+
+
+    def _StopAcquisitionParam(self, module, parameter, params, value):
+        '''_StopAcquisitionParam stops acquisition and exits the application. The
+        parameter is in the form stop_acquisition/<client name>/<shutdown PC>
+        '''
+        if len(params) < 3:
+            return
+
+        if params[2].lower() in self._TRUE_STRINGS:
+            shutdown = True
+            self.logger.info("Stop acquisition command received from client %s. " +
+                "System will be shut down.", params[1])
+        else:
+            shutdown = False
+            self.logger.info("Stop acquisition command received from client %s. " +
+                "Acquisition program will be terminated but PC will remain running.", params[1])
+        self.StopAcquisition(exit_app=True, shutdown_on_exit=shutdown)
+
+
+    def QueueParameterChange(self, module, parameter, value):
+        '''QueueParameterChange stores a parameter change to be emitted by EmitParameterChanges
+        when the parameter timer expires. A pending change to the same parameter is replaced.
+        '''
+        self._pending_param_updates[(module, parameter)] = value
+        if not self.paramTimer.isActive():
+            self.paramTimer.start(self.PARAM_COALESCE_MS)
+
+
+    @QtCore.pyqtSlot()
+    def EmitParameterChanges(self):
+        '''EmitParameterChanges emits the parameterChanged signal for each pending
+        parameter change.
+        '''
+        pending = self._pending_param_updates
+        self._pending_param_updates = {}
+        for (module, parameter), value in pending.items():
+            self.parameterChanged.emit(module, parameter, value, 1, '')
 
 
     @QtCore.pyqtSlot(str, str)
@@ -1721,7 +2415,7 @@ class AcquisitionBase(QtCore.QObject):
         this method.
         '''
 
-        cam_names = list(self.received.keys())
+        cam_names = self._camera_names
 
         #  split the parameter path
         params = parameter.split('/')
@@ -1731,14 +2425,10 @@ class AcquisitionBase(QtCore.QObject):
 
         if module.lower() == 'acquisition':
 
-            if params[0].lower() == 'camera_list':
-                #  build a comma separated list of cameras names and emit
-                param_value = ','.join(cam_names)
-                self.parameterChanged.emit(module, parameter, param_value, 1, '')
-
-            elif params[0].lower() == 'is_triggering':
-                #  emit "1" if we're currently triggering and "0" if not
-                self.parameterChanged.emit(module, parameter, str(int(self.isTriggering)), 1, '')
+            #  check if this is one of our acquisition parameters
+            handler = self._acq_get_handlers.get(params[0].lower())
+            if handler is not None:
+                handler(module, parameter, params)
 
             #  check if the first param path element is a camera
             elif params[0] in cam_names:
@@ -1747,13 +2437,9 @@ class AcquisitionBase(QtCore.QObject):
                 if len(params) < 2:
                     return
 
-                if params[1].lower() == 'gain':
-                    param_value = self.cameras[params[0]].get_gain()
-                    if param_value:
-                        self.parameterChanged.emit(module, parameter, str(param_value), 1, '')
-
-                elif params[1].lower() == 'exposure':
-                    param_value = self.cameras[params[0]].get_exposure()
+                getter = self._CAMERA_GET_METHODS.get(params[1].lower())
+                if getter is not None:
+                    param_value = getattr(self.cameras[params[0]], getter)()
                     if param_value:
                         self.parameterChanged.emit(module, parameter, str(param_value), 1, '')
 
@@ -1784,7 +2470,7 @@ class AcquisitionBase(QtCore.QObject):
         '''
 
         #  get a list of our current cameras
-        cam_names = list(self.received.keys())
+        cam_names = self._camera_names
 
         #  split the parameter path
         params = parameter.split('/')
@@ -1792,34 +2478,15 @@ class AcquisitionBase(QtCore.QObject):
             #  no parameter provided
             return
 
-        if module.lower() == 'acquisition':
+        #  lower case the module name once for the comparisons below
+        module_lc = module.lower()
+        if module_lc == 'acquisition':
             #  this is a parameter related to acquisition
 
-            if params[0].lower() == 'start_triggering':
-                if not self.isTriggering:
-                    self.isTriggering = True
-                    self.triggerTimer.start(250)
-                self.parameterChanged.emit(module, 'is_triggering', str(int(self.isTriggering)), 1, '')
-
-            elif params[0].lower() == 'stop_triggering':
-                if self.isTriggering:
-                    self.isTriggering = False
-                self.parameterChanged.emit(module, 'is_triggering', str(int(self.isTriggering)), 1, '')
-
-            elif params[0].lower() == 'stop_acquisition':
-
-                try:
-                    if params[2].lower() in ['yes', 'true', '1', 't']:
-                        shutdown = True
-                        self.logger.info("Stop acquisition command received from client " + params[1] +
-                            ". System will be shut down.")
-                    else:
-                        shutdown = False
-                        self.logger.info("Stop acquisition command received from client " + params[1] +
-                            ". Acquisition program will be terminated but PC will remain running.")
-                    self.StopAcquisition(exit_app=True, shutdown_on_exit=shutdown)
-                except:
-                    pass
+            #  check if this is one of our acquisition parameters
+            handler = self._acq_set_handlers.get(params[0].lower())
+            if handler is not None:
+                handler(module, parameter, params, value)
 
             #  check if this is a camera specific parameter
             elif params[0] in cam_names:
@@ -1828,37 +2495,43 @@ class AcquisitionBase(QtCore.QObject):
                     #  no param provided, don't know what to do so just return
                     return
 
-                if params[1].lower() == 'gain':
-                    #  this is a set gain command for the specified camera
-                    try:
-                        ok = self.cameras[params[0]].set_gain(float(value))
-                        if ok:
-                            param_value = self.cameras[params[0]].get_gain()
-                            self.parameterChanged.emit(module, parameter, str(param_value), 1, '')
-                    except:
-                        pass
-
-                elif params[1].lower() == 'exposure':
-                    #  this is a set exposure command for the specified camera
+                methods = self._CAMERA_SET_METHODS.get(params[1].lower())
+                if methods is not None:
+                    #  this is a set gain or exposure command for the specified camera
+                    setter, getter = methods
                     try:
-                        ok = self.cameras[params[0]].set_exposure(float(value))
-                        if ok:
-                            param_value = self.cameras[params[0]].get_exposure()
-                            self.parameterChanged.emit(module, parameter, str(param_value), 1, '')
-                    except:
-                        pass
+                        value = float(value)
+                    except ValueError:
+                        #  the value isn't a number
+                        return
+                    cam = self.cameras[params[0]]
+                    ok = getattr(cam, setter)(value)
+                    if ok:
+                        param_value = getattr(cam, getter)()
+                        self.QueueParameterChange(module, parameter, str(param_value))
 
         #  Users can send data to attached sensors to configure or control them.
         #      module = "sensors"
         #      parameter = sensor name (as specified in configuration file)
         #      value = string containing the datagram to send to the sensor
-        elif module.lower() == 'sensors':
+        elif module_lc == 'sensors':
             #  this is a param being sent to a sensor - check if the sensor exists
             if params[0] in self.serialSensors.devices:
                 #  it does, send the datagram to the device
                 self.serialSensors.txData(params[0], value)
 
 
+    @QtCore.pyqtSlot()
+    def FlushAsyncData(self):
+        '''FlushAsyncData writes the buffered async sensor data to the database.
+        '''
+        self.asyncFlushTimer.stop()
+        if self._pending_async_data:
+            #  hand the buffer to the database writer and start a new one
+            self.dbWrite.emit('insert_async_data_batch', (self._pending_async_data,))
+            self._pending_async_data = []
+
+
     @QtCore.pyqtSlot(str, str, datetime.datetime, str)
     def SensorDataAvailable(self, sensor_id, header, rx_time, data):
         '''
@@ -1886,60 +2559,62 @@ class AcquisitionBase(QtCore.QObject):
             None
         '''
 
-        #  check if we should log this data
-        if sensor_id in self.configuration['sensors']['installed_sensors']:
-
-            #  check if we're supposed to ignore this datagram
-            if header in self.configuration['sensors']['installed_sensors'][sensor_id]['ignore_headers']:
-                #  this is a sensor header that we are ignoring so we just move along
-                return
-
-            #  determine if this data is synced or async
-            is_synchronous = self.default_is_synchronous
-            if header in self.configuration['sensors']['synchronous']:
-                is_synchronous = True
-            elif header in self.configuration['sensors']['asynchronous']:
-                is_synchronous = False
-
-            if is_synchronous:
-                #  this data should be cached to be written to the db when the cameras are triggered
-
-                #  first check if we have an entry for this sensor
-                if sensor_id not in self.syncdSensorData:
-                    #  nope, add it
-                    self.syncdSensorData[sensor_id] = {}
-
-                #  add the data
-                self.syncdSensorData[sensor_id][header] = {'time':rx_time, 'data':data}
-
-            else:
-                #  this is async sensor data so we (possibly) just write it
-                if self.use_db:
-
-                    #  assume that we will write this data to the database
-                    write_async = True
-
-                    #  check if we're logging this data on an interval
-                    if self.configuration['sensors']['installed_sensors'][sensor_id]['logging_interval_ms']:
-                        #  logging_interval_ms is not none, so yes. Check when we last wrote this data
-                        if self.configuration['sensors']['installed_sensors'][sensor_id]['last_write']:
-                            #  we have a last_write time - check the interval to see if we need to write this data
-                            time_diff = rx_time - self.configuration['sensors']['installed_sensors'][sensor_id]['last_write']
-                            if ((time_diff.seconds * 1000) >=
-                                    self.configuration['sensors']['installed_sensors'][sensor_id]['logging_interval_ms']):
-                                self.configuration['sensors']['installed_sensors'][sensor_id]['last_write'] = rx_time
-                            else:
-                                #  we don't need to log this data
-                                write_async = False
+        #  get the logging action for this sensor and header
+        key = (sensor_id, header)
+        sensor_action = self._sensor_actions.get(key)
+        if sensor_action is None:
+            sensor_action = self._GetSensorAction(sensor_id, header)
+        action, sensor_cfg = sensor_action
+
+        if action == self.SENSOR_SYNC:
+            #  this data should be cached to be written to the db when the cameras are triggered
+
+            #  the data are keyed by (sensor_id, header) and stored as a tuple of
+            #  (rx_time, data, mono). rx_time is written to the db and mono is used
+            #  to check freshness.
+            self.syncdSensorData[key] = (rx_time, data, _monotonic())
+
+        elif action == self.SENSOR_ASYNC:
+            #  this is async sensor data so we (possibly) just write it. Data received
+            #  after the database writer was told to stop is ignored.
+            if self.use_db and not self.db_writer_stopped:
+
+                #  assume that we will write this data to the database
+                write_async = True
+
+                #  check if we're logging this data on an interval
+                logging_interval_ms = sensor_cfg['logging_interval_ms']
+                if logging_interval_ms:
+                    #  logging_interval_ms is not none, so yes. Check when we last wrote this data
+                    #  last_write_ms is the monotonic clock time in ms of the last write
+                    now_ms = time.monotonic_ns() // 1000000
+                    last_write_ms = sensor_cfg['last_write_ms']
+                    if last_write_ms is not None:
+                        #  we have a last_write time - check the interval to see if we need to write this data
+                        if (now_ms - last_write_ms) >= logging_interval_ms:
+                            sensor_cfg['last_write_ms'] = now_ms
                         else:
-                            #  this is the first time we're logging this sensor's data
-                            self.configuration['sensors']['installed_sensors'][sensor_id]['last_write'] = rx_time
-
-                    if write_async:
-                        self.db.insert_async_data(sensor_id, header, rx_time, data)
+                            #  we don't need to log this data
+                            write_async = False
+                    else:
+                        #  this is the first time we're logging this sensor's data
+                        sensor_cfg['last_write_ms'] = now_ms
+
+                if write_async:
+                    #  buffer the data - it is written in FlushAsyncData
+                    pending = self._pending_async_data
+                    pending.append((sensor_id, header, rx_time, data))
+                    if len(pending) >= self.ASYNC_FLUSH_ROWS:
+                        self.FlushAsyncData()
+                    elif not self.asyncFlushTimer.isActive():
+                        self.asyncFlushTimer.start(self.ASYNC_FLUSH_MS)
+
+        elif action == self.SENSOR_IGNORE:
+            #  this is a sensor header that we are ignoring so we just move along
+            return
 
         #  lastly emit the sensorData signal to send it to the server
-        self.sensorData.emit(sensor_id, header, rx_time, data)
+        self._sensor_data_emit(sensor_id, header, rx_time, data)
 
 
     def ReadConfig(self, config_file, config_dict):
@@ -1948,17 +2623,29 @@ class AcquisitionBase(QtCore.QObject):
         '''
 
         #  read the configuration file
-        with open(config_file, 'r') as cf_file:
-            try:
-                config = yaml.safe_load(cf_file)
-            except yaml.YAMLError as exc:
-                self.logger.error('Error reading configuration file ' + self.config_file)
-                self.logger.error('  Error string:' + str(exc))
-                self.logger.error('  We will try to proceed, but things are probably not going to ' +
-                        'work like you want them too.')
+        try:
+            with open(config_file, 'r') as cf_file:
+                config = _yaml_safe_load(cf_file)
+        except (YAMLError, OSError):
+            self.logger.exception('Error reading configuration file %s', config_file)
+            self.logger.error('  We will try to proceed, but things are probably not going to ' +
+                    'work like you want them too.')
+            config = {}
+
+        #  Update/extend the configuration values and return. The config dicts are
+        #  flattened so the merge is a single dict update.
+        flat_config = _flatten(config_dict)
+        flat_update = _flatten(config)
 
-        # Update/extend the configuration values and return
-        return self.__update(config_dict, config)
+        #  convert YAML 1.1 style booleans if the default is a bool
+        if _YAML_NEEDS_BOOL_FIXUP:
+            for key, value in flat_update.items():
+                if isinstance(value, str) and isinstance(flat_config.get(key), bool):
+                    flat_update[key] = _YAML11_BOOLS.get(value.lower(), value)
+
+        flat_config.update(flat_update)
+
+        return _unflatten(flat_config)
 
 
     def ExternalStop(self):
@@ -1972,18 +2659,32 @@ class AcquisitionBase(QtCore.QObject):
 
     def __update(self, d, u):
             """
-            Update a nested dictionary or similar mapping.
+            Update a nested dictionary or similar mapping in place. Nested
+            dicts in d that are updated are copied first so mappings shared
+            with other configurations are not modified.
 
-            Source: https://stackoverflow.com/questions/3232943/update-value-of-a-nested-dictionary-of-varying-depth
+            Adapted from: https://stackoverflow.com/questions/3232943/update-value-of-a-nested-dictionary-of-varying-depth
             Credit: Alex Martelli / Alex Telon
             """
-            for k, v in u.items():
-                if isinstance(v, collections.abc.Mapping):
-                    #  if a value is None, just assign the value, otherwise keep going
-                    if d.get(k, {}) is None:
-                        d[k] = v
+            #  walk the nested mappings with a stack instead of recursing
+            stack = [(d, u)]
+            while stack:
+                d_level, u_level = stack.pop()
+                for k, v in u_level.items():
+                    #  get the existing value once - _MISSING marks keys not in d
+                    existing = d_level.get(k, _MISSING)
+                    if isinstance(v, _Mapping):
+                        #  if a value is None, just assign the value, otherwise keep going
+                        if existing is None:
+                            d_level[k] = v
+                        else:
+                            sub = {} if existing is _MISSING else dict(existing)
+                            d_level[k] = sub
+                            stack.append((sub, v))
                     else:
-                        d[k] = self.__update(d.get(k, {}), v)
-                else:
-                    d[k] = v
+                        #  convert YAML 1.1 style booleans if the default is a bool
+                        if (_YAML_NEEDS_BOOL_FIXUP and isinstance(v, str) and
+                                isinstance(existing, bool)):
+                            v = _YAML11_BOOLS.get(v.lower(), v)
+                        d_level[k] = v
             return d
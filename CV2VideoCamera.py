@@ -29,15 +29,22 @@ import datetime
 #import subprocess
 from PyQt5 import QtCore
 import ImageWriter
-import numpy as np
 import cv2
 
 
+#  the VideoCapture backends available to this OpenCV build don't change at
+#  runtime so they are queried once and cached by the get_*_backends functions
+_CAMERA_BACKENDS = None
+_STREAM_BACKENDS = None
+
+
 class CV2VideoCamera(QtCore.QObject):
 
     #  define PyQt Signals
-    imageData = QtCore.pyqtSignal(str, str, dict)
-    saveImage = QtCore.pyqtSignal(str, dict)
+    #  the image data dicts are emitted as object so PyQt passes a reference to the
+    #  dict instead of converting it to and from a QVariantMap on every emit.
+    imageData = QtCore.pyqtSignal(str, str, object)
+    saveImage = QtCore.pyqtSignal(str, object)
     imageSaved = QtCore.pyqtSignal(object, str)
     videoSaved = QtCore.pyqtSignal(str, str, int, int, datetime.datetime, datetime.datetime)
     error = QtCore.pyqtSignal(str, str)
@@ -47,6 +54,17 @@ class CV2VideoCamera(QtCore.QObject):
     triggerReady = QtCore.pyqtSignal(object, list, bool)
     triggerComplete = QtCore.pyqtSignal(object, bool)
 
+    #  the default image file name time format
+    DEFAULT_DATE_FORMAT = "D%Y%m%d-T%H%M%S.%f"
+
+    #  the OpenCV operation for each supported rotation. Values are a tuple of
+    #  (function, function argument, swaps width and height).
+    ROTATIONS = {'cw90':(cv2.rotate, cv2.ROTATE_90_CLOCKWISE, True),
+                 'cw180':(cv2.rotate, cv2.ROTATE_180, False),
+                 'cw270':(cv2.rotate, cv2.ROTATE_90_COUNTERCLOCKWISE, True),
+                 'flipud':(cv2.flip, 0, False),
+                 'fliplr':(cv2.flip, 1, False)}
+
 
     def __init__(self, cv_device_path, camera_name, resolution=(None, None), backend=None,
             parent=None):
@@ -58,7 +76,7 @@ class CV2VideoCamera(QtCore.QObject):
         self.hdr_enabled = False
         self.acquiring = False
         self.save_path = '.'
-        self.date_format = "D%Y%m%d-T%H%M%S.%f"
+        self.date_format = self.DEFAULT_DATE_FORMAT
         self.n_triggered = 0
         self.total_triggers = 0
         self.save_stills_divider = 1
@@ -69,12 +87,14 @@ class CV2VideoCamera(QtCore.QObject):
         self.label = 'camera'
         self.ND_pixelFormat = None
         self.camera_name = camera_name
+        self._fn_suffix = '_' + camera_name
         self.device_path = cv_device_path
         self.device_info = {}
         self.device_info['DeviceID'] = 'CV2VideoCamera' + '{' + str(self.device_path) + '}'
         self.device_info['DeviceVersion'] = ''
         self.camera_id = camera_name
         self.cam = None
+        self.frame_grabbed = False
         self.logger = logging.getLogger('Acquisition')
 
         #  get some basic properties
@@ -125,6 +145,13 @@ class CV2VideoCamera(QtCore.QObject):
         #  note the backend that we ultimately ended up with
         self.cv_backend = self.cam.getBackendName()
 
+        #  ask the backend to buffer a single frame so the frame we grab when triggered
+        #  is the newest one and not one that has been sitting in the driver's queue.
+        #  Not all backends support this.
+        if not self.cam.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+            self.logger.debug("%s: %s backend does not support setting the buffer size",
+                    self.camera_name, self.cv_backend)
+
         #  if a camera resolution was provided set it here. This must be done
         #  before any frames are acquired from the camera
         if resolution[0]:
@@ -238,6 +265,16 @@ class CV2VideoCamera(QtCore.QObject):
         return True
 
 
+    @QtCore.pyqtSlot(object)
+    def trigger_event(self, event):
+        '''trigger_event is the single argument form of trigger. event is a sequence of
+        the trigger arguments (cam_list, image_number, timestamp, save_image, emit_signal)
+        such as the TriggerEvent namedtuple emitted by AcquisitionBase. Passing a single
+        object reduces the signal marshalling overhead when triggering.
+        '''
+        self.trigger(*event)
+
+
     @QtCore.pyqtSlot(list, int, datetime.datetime, bool, bool)
     def trigger(self, cam_list, image_number, timestamp, save_image, emit_signal):
         '''trigger sets the camera up for the next trigger event and then either executes
@@ -278,17 +315,19 @@ class CV2VideoCamera(QtCore.QObject):
 
         #  check if we should trigger because of the divider
         if (self.total_triggers % self.trigger_divider) != 0:
-            #  nope, don't trigger. We emit the complete signal but unset
-            #  the trigger argument so acquisition knows the camera trigger
-            #  was skipped.
+            #  nope, don't trigger. We grab (but don't decode) a frame to keep the
+            #  stream current, then emit the complete signal but unset the trigger
+            #  argument so acquisition knows the camera trigger was skipped.
+            self.grab_frame()
             self.triggerComplete.emit(self, False)
             return
 
         #  If specific cameras are specified, check if we're one
         if (len(cam_list) > 0 and self not in cam_list):
-            #  nope, don't trigger. We emit the complete signal but unset
-            #  the trigger argument so acquisition knows the camera trigger
-            #  was skipped.
+            #  nope, don't trigger. We grab (but don't decode) a frame to keep the
+            #  stream current, then emit the complete signal but unset the trigger
+            #  argument so acquisition knows the camera trigger was skipped.
+            self.grab_frame()
             self.triggerComplete.emit(self, False)
             return
 
@@ -302,47 +341,43 @@ class CV2VideoCamera(QtCore.QObject):
         if not self.save_this_frame and not self.save_this_still:
             save_image = False
 
-        #  initialize some lists used to help us do what we do
-        self.filenames = []
-        self.do_signals = []
-        self.save_image = []
-        self.exposures = []
-        self.save_hdr = False
-        self.emit_hdr = False
+        #  store the state for this trigger. VideoCapture cameras don't support HDR
+        #  so there is only ever a single image per trigger.
+        self.do_signal = bool(emit_signal)
+        self.save_this_image = bool(save_image)
         self.trig_timestamp = timestamp
         self.image_number = image_number
 
         #  Generate the image number string
         if (image_number > 999999):
-            num_str = '%09d' % image_number
+            num_str = f'{image_number:09d}'
         else:
-            num_str = '%06d' % image_number
+            num_str = f'{image_number:06d}'
         self.image_num_str = num_str
 
-        #  generate the time string
-        time_str = timestamp.strftime(self.date_format)[:-3]
+        #  generate the time string. The default format is assembled directly
+        #  from the timestamp fields which is much faster than strftime.
+        if self.date_format == self.DEFAULT_DATE_FORMAT:
+            time_str = (f'D{timestamp.year:04d}{timestamp.month:02d}{timestamp.day:02d}'
+                    f'-T{timestamp.hour:02d}{timestamp.minute:02d}{timestamp.second:02d}'
+                    f'.{timestamp.microsecond // 1000:03d}')
+        else:
+            time_str = timestamp.strftime(self.date_format)[:-3]
 
         #  single images follow the "standard" camtrawl naming convention
-        self.filenames.append(self.save_path + num_str + '_' + time_str +
-                '_' + self.camera_name)
-
-        self.exposures.append(self.exposure)
-        if emit_signal:
-            self.do_signals.append(True)
-        else:
-            self.do_signals.append(False)
-        if save_image:
-            self.save_image.append(True)
-        else:
-            self.save_image.append(False)
+        self.filename = f'{self.save_path}{num_str}_{time_str}{self._fn_suffix}'
 
         #  set the trigger counter - this counter is used to track the
         #  number of triggers in this collection event. This will always be
         #  1 for standard acquisition and 4 for HDR acquisition.
         self.n_triggered = 1
 
-        self.logger.debug("%s triggered: Image number %d Save image: %s" %
-                (self.camera_name, image_number, save_image))
+        self.logger.debug("%s triggered: Image number %d Save image: %s",
+                self.camera_name, image_number, save_image)
+
+        #  grab the frame now so it is as close to the trigger time as possible. It
+        #  is decoded when it is retrieved in get_image.
+        self.frame_grabbed = self.grab_frame()
 
         #  Software trigger the camera
         self.sw_trig_timer.start(0)
@@ -377,13 +412,10 @@ class CV2VideoCamera(QtCore.QObject):
         if self.n_triggered == 0:
             return
 
-        #  get the index this event is associated with
-        idx = self.n_triggered - 1
-
         #  get the next image from the camera buffers
         image_data = self.get_image()
         image_data['timestamp'] = self.trig_timestamp
-        image_data['filename'] = self.filenames[idx]
+        image_data['filename'] = self.filename
         image_data['image_number'] = self.image_number
         image_data['save_still'] = self.save_this_still
         image_data['save_frame'] = self.save_this_frame
@@ -392,36 +424,24 @@ class CV2VideoCamera(QtCore.QObject):
         if (image_data['ok']):
 
             #  check if we're supposed to do anything with this image
-            if self.do_signals[idx] or self.save_image[idx] or self.save_hdr or self.emit_hdr:
+            if self.do_signal or self.save_this_image:
                 # We're saving and/or emitting some form of this image
 
-                #  apply rotation if required
-                if self.rotation == 'cw90':
-                    image_data['data'] = np.rot90(image_data['data'], k=-1)
-                    height = image_data['height']
-                    width = image_data['width']
-                    image_data['width'] = height
-                    image_data['height'] = width
-                elif self.rotation == 'cw180':
-                    image_data['data'] = np.rot90(image_data['data'], k=-2)
-                elif self.rotation == 'cw270':
-                    image_data['data'] = np.rot90(image_data['data'], k=-3)
-                    height = image_data['height']
-                    width = image_data['width']
-                    image_data['width'] = height
-                    image_data['height'] = width
-                elif self.rotation == 'flipud':
-                    image_data['data'] = np.flipud(image_data['data'])
-                elif self.rotation == 'fliplr':
-                    image_data['data'] = np.fliplr(image_data['data'])
+                #  apply rotation if required. cv2.rotate and cv2.flip return contiguous
+                #  arrays which the image writer can use without another copy.
+                if self.rotate_op is not None:
+                    rotate_func, rotate_arg, swap_dims = self.rotate_op
+                    image_data['data'] = rotate_func(image_data['data'], rotate_arg)
+                    if swap_dims:
+                        image_data['width'], image_data['height'] = image_data['height'], image_data['width']
 
 
                 #  check if we need to emit a signal for this image
-                if self.do_signals[idx]:
+                if self.do_signal:
                     self.imageData.emit(self.camera_name, self.label, image_data)
 
                 #  check if we're saving this image
-                if self.save_image[idx]:
+                if self.save_this_image:
                     self.saveImage.emit(self.camera_name, image_data)
 
         else:
@@ -433,8 +453,8 @@ class CV2VideoCamera(QtCore.QObject):
         self.n_triggered = 0
 
 
-    def load_hdr_reponse(self, filename):
-        '''load_hdr_reponse loads a numpy file containing the camera sensor reposonse data
+    def load_hdr_response(self, filename):
+        '''load_hdr_response loads a numpy file containing the camera sensor reposonse data
         which is used for certain HDR image fusion methods.
         '''
         #TODO Implement this feature
@@ -450,21 +470,35 @@ class CV2VideoCamera(QtCore.QObject):
         return True
 
 
+    @property
+    def rotation(self):
+        '''rotation is the name of the rotation applied to images. Setting it looks
+        up the OpenCV operation once so exposure_end doesn't have to on every image.
+        Unknown values disable rotation.
+        '''
+        return self._rotation
+
+
+    @rotation.setter
+    def rotation(self, rotation):
+        self._rotation = rotation
+        self.rotate_op = self.ROTATIONS.get(rotation)
+
+
     def set_exposure(self, exposure):
         '''
         set_exposure sets the camera exposure. This method may or may not work
         depending on the backend VideoCapture is using and your specific camera.
         This method is requried to ensure API compatibility.
         '''
-
-        try:
-            self.cam.set(cv2.CAP_PROP_EXPOSURE, exposure)
-            #  set the value based on what was passed in, not from querying VideoCapture
-            #  since that doesn't usually return valid data.
-            self.exposure = exposure
-        except:
+        if self.cam is None:
             return False
 
+        self.set_properties({cv2.CAP_PROP_EXPOSURE:exposure})
+        #  set the value based on what was passed in, not from querying VideoCapture
+        #  since that doesn't usually return valid data.
+        self.exposure = exposure
+
         return True
 
 
@@ -474,37 +508,72 @@ class CV2VideoCamera(QtCore.QObject):
         depending on the backend VideoCapture is using and your specific camera.
         This method is requried to ensure API compatibility.
         '''
-        try:
-            self.cam.set(cv2.CAP_PROP_GAIN, gain)
-            #  set the value based on what was passed in, not from querying VideoCapture
-            #  since that doesn't usually return valid data.
-            self.gain = gain
-        except:
+        if self.cam is None:
             return False
 
+        self.set_properties({cv2.CAP_PROP_GAIN:gain})
+        #  set the value based on what was passed in, not from querying VideoCapture
+        #  since that doesn't usually return valid data.
+        self.gain = gain
+
         return True
 
 
+    def set_properties(self, properties):
+        '''
+        set_properties sets multiple VideoCapture properties in one call. properties
+        is a dict keyed by cv2.CAP_PROP_* id. Properties that the backend rejects or
+        doesn't support are skipped. Returns True if all of the properties were set.
+        '''
+        if self.cam is None:
+            return False
+
+        all_set = True
+        for prop, value in properties.items():
+            try:
+                if not self.cam.set(prop, value):
+                    all_set = False
+            except cv2.error:
+                all_set = False
+
+        return all_set
+
+
+    def grab_frame(self):
+        '''grab_frame grabs the next frame from the camera without decoding it and
+        returns True if a frame was grabbed. The frame can then be decoded by get_image.
+        '''
+        if self.cam is None:
+            return False
+
+        return self.cam.grab()
+
+
     def get_image(self):
         '''get_image gets the next image from the camera buffers, does some error
-        checking, converts the image, and then returns it.
+        checking, converts the image, and then returns it. If a frame was grabbed
+        when the camera was triggered, that frame is decoded. Otherwise the next
+        frame is grabbed and decoded.
         '''
         #  define the return dict
         image_data = {'data':None, 'ok':False, 'exposure':-1, 'gain':-1, 'is_hdr':False}
 
         #  get the image
-        state, raw_image =  self.cam.read()
+        state = self.frame_grabbed or self.cam.grab()
+        self.frame_grabbed = False
+        if state:
+            state, raw_image = self.cam.retrieve()
         if not state:
             #  timed out waiting for image
             self.error.emit(self.camera_name, 'Timed out waiting for image...')
             return image_data
-        #  populate the return dict
-        image_data['data'] = raw_image.copy()
+        #  populate the return dict. The cv2 bindings return each frame in a newly
+        #  allocated numpy array that we own, so it is passed on without copying.
+        image_data['data'] = raw_image
         image_data['ok'] = True
         image_data['exposure'] = self.exposure
         image_data['gain'] = self.gain
-        image_data['height'] = raw_image.shape[1]
-        image_data['width'] = raw_image.shape[0]
+        image_data['height'], image_data['width'] = raw_image.shape[:2]
 
         #  and return the converted one
         return image_data
@@ -531,13 +600,13 @@ class CV2VideoCamera(QtCore.QObject):
         #  Reset n_triggered
         self.n_triggered = 0
 
-        #  set up the file logging directory - create if needed
-        self.save_path = os.path.normpath(file_path) + os.sep + self.camera_name + os.sep
+        #  set up the file logging directory - create if needed. The path is resolved
+        #  once here and the per image file names are built from it when triggered.
+        self.save_path = os.path.join(os.path.normpath(file_path), self.camera_name, '')
 
         try:
-            if not os.path.exists(self.save_path):
-                os.makedirs(self.save_path)
-        except:
+            os.makedirs(self.save_path, exist_ok=True)
+        except OSError:
             self.error.emit(self.camera_name, 'Unable to create file logging directory: %s' %
                     self.save_path)
             self.acquisitionStarted.emit(self, self.camera_name, False)
@@ -575,9 +644,10 @@ class CV2VideoCamera(QtCore.QObject):
 
         try:
 
-            #  read a few frames to get things rolling
+            #  grab a few frames to get things rolling. The frames are discarded
+            #  so we don't decode them.
             for i in range(5):
-                state, raw_image = self.cam.read()
+                self.cam.grab()
 
             #  Begin acquiring images
             self.acquiring = True
@@ -696,14 +766,13 @@ def get_camera_backends():
     get_camera_backends returns a dict, keyed by backend name containing
     the camera backends that the platform's OpenCV supports.
     '''
-    cam_backends = cv2.videoio_registry.getCameraBackends()
-    backend_names = {}
+    global _CAMERA_BACKENDS
 
-    for backend in cam_backends:
-        name = cv2.videoio_registry.getBackendName(backend)
-        backend_names[name] = backend
+    if _CAMERA_BACKENDS is None:
+        _CAMERA_BACKENDS = {cv2.videoio_registry.getBackendName(backend):backend
+                for backend in cv2.videoio_registry.getCameraBackends()}
 
-    return backend_names
+    return dict(_CAMERA_BACKENDS)
 
 
 def get_stream_backends():
@@ -711,15 +780,13 @@ def get_stream_backends():
     get_stream_backends returns a dict, keyed by backend name containing
     the stream backends that the platform's OpenCV supports.
     '''
+    global _STREAM_BACKENDS
 
-    cam_backends = cv2.videoio_registry.getStreamBackends()
-    backend_names = {}
-
-    for backend in cam_backends:
-        name = cv2.videoio_registry.getBackendName(backend)
-        backend_names[name] = backend
+    if _STREAM_BACKENDS is None:
+        _STREAM_BACKENDS = {cv2.videoio_registry.getBackendName(backend):backend
+                for backend in cv2.videoio_registry.getStreamBackends()}
 
-    return backend_names
+    return dict(_STREAM_BACKENDS)
 
 
 
@@ -35,7 +35,6 @@
 
 
 import os
-import shutil
 import datetime
 from AcquisitionBase import AcquisitionBase
 from PyQt5 import QtCore
@@ -72,12 +71,10 @@ class CamtrawlAcquisition(AcquisitionBase):
         #  sensors section in AcquisitionSetup2 to ensure that it is ignored during sensor
         #  setup in AcquisitionSetup since we treat the controller differently than a
         #  standard sensor.
-        self.configuration['controller'] = {}
-
-        self.configuration['controller']['use_controller'] = False
-        self.configuration['controller']['serial_port'] = 'COM3'
-        self.configuration['controller']['baud_rate'] = 921600
-        self.configuration['controller']['strobe_pre_fire'] = 150
+        self.configuration['controller'] = {'use_controller':False,
+                                            'serial_port':'COM3',
+                                            'baud_rate':921600,
+                                            'strobe_pre_fire':150}
 
 
     def AcquisitionSetup2(self):
@@ -114,7 +111,8 @@ class CamtrawlAcquisition(AcquisitionBase):
                 self.configuration['sensors']['asynchronous'].extend(['$CTCS', '$SBCS', '$IMUC', '$CTSV', 'setPCState'])
                 self.configuration['sensors']['installed_sensors']['CTControl'] = {}
                 self.configuration['sensors']['installed_sensors']['CTControl']['logging_interval_ms'] = None
-                self.configuration['sensors']['installed_sensors']['CTControl']['ignore_headers'] = []
+                self.configuration['sensors']['installed_sensors']['CTControl']['ignore_headers'] = frozenset()
+                self._bind_sensor_config()
 
                 #  start the controller.
                 self.StartController()
@@ -131,7 +129,7 @@ class CamtrawlAcquisition(AcquisitionBase):
                 #  start the trigger timer. Set a long initial interval
                 #  to allow the cameras time to finish getting ready.
                 self.isTriggering = True
-                self.triggerTimer.start(1000)
+                self.StartTriggerTimer(1000)
 
         else:
             #  no, something didn't work out so check if we're supposed to shut down.
@@ -145,10 +143,8 @@ class CamtrawlAcquisition(AcquisitionBase):
                 #  set the shutdownOnExit attribute so we, er shutdown on exit
                 self.shutdownOnExit = True
 
-                #  complete setup of our shutdown timer and start it
-                self.shutdownTimer.timeout.connect(self.AcqisitionTeardown)
                 #  delay shutdown for 5 minutes
-                self.shutdownTimer.start(5000 * 60)
+                self.StartShutdownTimer(5000 * 60, self.AcqisitionTeardown)
 
             else:
                 #  Stop acquisition and close the app
@@ -162,9 +158,9 @@ class CamtrawlAcquisition(AcquisitionBase):
         board which provides power control, sensor integration, and camera and
         strobe triggering for the Camtrawl camera platform.
         '''
-        self.logger.info("Connecting to Camtrawl controller on port: " +
-                self.configuration['controller']['serial_port'] + " baud: " +
-                str(self.configuration['controller']['baud_rate']))
+        self.logger.info("Connecting to Camtrawl controller on port: %s baud: %s",
+                self.configuration['controller']['serial_port'],
+                self.configuration['controller']['baud_rate'])
 
         #  create an instance of CamtrawlController
         self.controller = CamtrawlController.CamtrawlController(serial_port=
@@ -201,10 +197,10 @@ class CamtrawlAcquisition(AcquisitionBase):
                     self.logger.info("    Type: PA4-LD")
                 else:
                     self.logger.info("    Type: Analog")
-                self.logger.info("    Depth conversion slope: %8.4f" % (data['slope']))
-                self.logger.info("    Depth conversion offset: %8.4f" % (data['intercept']))
-                self.logger.info("    System turn-on depth: %d" % (data['turn_on_depth']))
-                self.logger.info("    System turn-off depth: %d" % (data['turn_off_depth']))
+                self.logger.info("    Depth conversion slope: %8.4f", data['slope'])
+                self.logger.info("    Depth conversion offset: %8.4f", data['intercept'])
+                self.logger.info("    System turn-on depth: %d", data['turn_on_depth'])
+                self.logger.info("    System turn-off depth: %d", data['turn_off_depth'])
             else:
                 self.logger.info("Pressure sensor is not installed.")
 
@@ -212,14 +208,14 @@ class CamtrawlAcquisition(AcquisitionBase):
 
             if data['enabled'] > 0:
                 self.logger.info("System voltage monitoring enabled.")
-                self.logger.info("    Startup voltage threshold: %8.4f" % (data['startup_threshold']))
+                self.logger.info("    Startup voltage threshold: %8.4f", data['startup_threshold'])
             else:
                 self.logger.info("System voltage monitoring disabled.")
 
         elif header == 'getShutdownVoltage':
 
             if data['enabled'] > 0:
-                self.logger.info("    Shutdown voltage threshold: %8.4f" % (data['shutdown_threshold']))
+                self.logger.info("    Shutdown voltage threshold: %8.4f", data['shutdown_threshold'])
 
 
     @QtCore.pyqtSlot(int)
@@ -266,7 +262,7 @@ class CamtrawlAcquisition(AcquisitionBase):
 
                 forcedOn = new_state == self.controller.FORCED_ON
 
-                if not forcedOn or self.configuration['application']['shut_down_on_exit']:
+                if not forcedOn or self._shut_down_on_exit:
                     #  ok, we're shutting down.
 
                     #  we don't want to get into a boot loop so we want to give the
@@ -286,8 +282,7 @@ class CamtrawlAcquisition(AcquisitionBase):
                     #  configure the shutdown timer to call a method that sends the controller
                     #  the shutdown command. The controller will respond with the new
                     #  state and the next shutdown tasks are handled below.
-                    self.shutdownTimer.timeout.connect(self.DelayedShutdownHandler)
-                    self.shutdownTimer.start(delay)
+                    self.StartShutdownTimer(delay, self.DelayedShutdownHandler)
 
                 else:
                     #  shut_down_on_exit is not set and the system is in maintenance mode
@@ -303,8 +298,7 @@ class CamtrawlAcquisition(AcquisitionBase):
             #  If the state hasn't changed we just return. This wouldn't normally happen
             return
 
-        self.logger.info("Camtrawl controller state changed. New state is " +
-                str(new_state))
+        self.logger.info("Camtrawl controller state changed. New state is %s", new_state)
 
         if ((new_state == self.controller.FORCED_ON) and not
                 self.configuration['application']['always_trigger_at_start']):
@@ -322,7 +316,7 @@ class CamtrawlAcquisition(AcquisitionBase):
             self.internalTriggering = True
             self.isTriggering = True
             #  The first trigger interval is long to ensure the cameras are ready
-            self.triggerTimer.start(500)
+            self.StartTriggerTimer(500)
 
         elif new_state == self.controller.AT_DEPTH:
             #  the pressure sensor reports a depth >= the controller turn on depth
@@ -332,7 +326,7 @@ class CamtrawlAcquisition(AcquisitionBase):
             self.internalTriggering = True
             self.isTriggering = True
             #  The first trigger interval is long to ensure the cameras are ready
-            self.triggerTimer.start(500)
+            self.StartTriggerTimer(500)
 
         elif new_state == self.controller.PRESSURE_SW_CLOSED:
             #  the "pressure switch" has closed - we assume we're deployed at depth
@@ -341,7 +335,7 @@ class CamtrawlAcquisition(AcquisitionBase):
             self.internalTriggering = True
             self.isTriggering = True
             #  The first trigger interval is long to ensure the cameras are ready
-            self.triggerTimer.start(500)
+            self.StartTriggerTimer(500)
 
         elif new_state >= self.controller.FORCE_ON_REMOVED:
             #  The controller is in one of many shutdown states
@@ -396,26 +390,22 @@ class CamtrawlAcquisition(AcquisitionBase):
         self.controller.sendShutdownSignal()
 
 
-    @QtCore.pyqtSlot()
-    def CheckDiskFreeSpace(self):
+    @QtCore.pyqtSlot(int)
+    def CheckDiskFreeSpace(self, disk_free_mb):
         '''
-        CheckDiskFreeSpace checks the available free space for the data directory and
-        stops acquisition if it drops below the min threshold.
+        CheckDiskFreeSpace is called by the disk monitor with the available free space
+        for the data directory and stops acquisition if it drops below the min threshold.
         '''
 
-        #  get the disk free space in MB
-        disk_stats = shutil.disk_usage(self.image_dir)
-        disk_free_mb = disk_stats.free / 1024 / 1024
+        if disk_free_mb <= self._disk_free_min_mb:
 
-        if disk_free_mb <= self.configuration['application']['disk_free_min_mb']:
-
-            #  stop the timer
-            self.diskStatTimer.stop()
+            #  stop the disk monitor
+            self.stopDiskMonitor.emit()
 
             #  Log that we're stopping because we're out of disk space
             self.logger.critical("The system is stopping because the data disk is full.")
-            self.logger.critical("  Free space: %d MB is less than the " % (disk_free_mb) +
-                    "minimum allowed %d MB" % (self.configuration['application']['disk_free_min_mb']))
+            self.logger.critical("  Free space: %d MB is less than the " +
+                    "minimum allowed %d MB", disk_free_mb, self._disk_free_min_mb)
 
             #  if we're using the controller, we don't stop, but signal the controller
             #  we want to stop.
@@ -428,7 +418,7 @@ class CamtrawlAcquisition(AcquisitionBase):
             else:
                 #  Stop acquisition and close the app
                 self.StopAcquisition(exit_app=True,
-                        shutdown_on_exit=self.configuration['application']['shut_down_on_exit'])
+                        shutdown_on_exit=self._shut_down_on_exit)
 
 
     @QtCore.pyqtSlot(str, str)
@@ -439,17 +429,17 @@ class CamtrawlAcquisition(AcquisitionBase):
             #  issue is related to opening the serial port and we will assume we
             #  will not be able to use the controller. If we're told to use the
             #  controller and we can't we consider this a fatal error and bail.
-            self.logger.critical("Unable to connect to the Camtrawl controller @ port: "+
-                self.configuration['controller']['serial_port'] + " baud: " +
-                str(self.configuration['controller']['baud_rate']))
-            self.logger.critical("    ERROR: " + error)
+            self.logger.critical("Unable to connect to the Camtrawl controller @ port: %s baud: %s",
+                self.configuration['controller']['serial_port'],
+                self.configuration['controller']['baud_rate'])
+            self.logger.critical("    ERROR: %s", error)
             #TODO: Need to clean up this exit path - there is still a thread
             #      running when we exit here
             self.StopAcquisition(exit_app=True)
             return
 
         #  log the serial error. Normally this will never get called.
-        self.logger.error("Camtrawl Controller Serial error: " + error)
+        self.logger.error("Camtrawl Controller Serial error: %s", error)
 
 
     def ConfigureCameras(self):
@@ -471,14 +461,11 @@ class CamtrawlAcquisition(AcquisitionBase):
             #  get a reference to our spinCamera object
             sc = self.cameras[cam_name]
 
-            # get the configuration for this camera.
-            _, config = self.GetCameraConfiguration(sc.camera_name)
-
             # The Camtrawl controller has two camera trigger ports, 0 and 1.
             # You must specify the controller port each camera is connected to
             # to ensure they are triggered correctly. This dict allows us
             # to map the individual camera objects to their controller ports.
-            self.controller_port[sc] = config['controller_trigger_port']
+            self.controller_port[sc] = self.camera_params[cam_name].controller_trigger_port
 
             # Here we connect the camera's triggerReady signal to this class's
             # HWTriggerReady slot. This signal informs the app when a
@@ -486,7 +473,7 @@ class CamtrawlAcquisition(AcquisitionBase):
             # app tells the controller to hardware trigger the cameras.
             if self.configuration['controller']['use_controller']:
                 if sc in self.hw_triggered_cameras:
-                    sc.triggerReady.connect(self.HWTriggerReady)
+                    sc.triggerReady.connect(self.HWTriggerReady, QtCore.Qt.QueuedConnection)
 
         return ok
 
@@ -619,7 +606,7 @@ class CamtrawlAcquisition(AcquisitionBase):
         '''
 
         #  for debugging, indicate that this camera is ready
-        self.logger.debug(cam.camera_name + ":  Ready to hardware trigger")
+        self.logger.debug("%s:  Ready to hardware trigger", cam.camera_name)
 
         #  update some state info for this camera
         self.readyToTrigger[cam] = True
@@ -634,7 +621,7 @@ class CamtrawlAcquisition(AcquisitionBase):
         else:
             #  If this camera is not going to be triggered, we set self.received
             #  for this camera to True so we don't wait for it.
-            self.received[cam.camera_name] = True
+            self.SetCameraReceived(cam.camera_name)
 
         #  track the longest camera exposure - this ends up being our strobe exposure
         if self.maxExposure < exposure_us:
@@ -160,7 +160,7 @@ class CamtrawlController(QtCore.QObject):
         '''
         msg = "setPCState,1\n"
         self.txSerialData.emit(self.deviceParams['deviceName'], msg)
-        self.logger.debug("CamtrawlController sent: " + msg)
+        self.logger.debug("CamtrawlController sent: %s", msg)
 
 
     def sendShutdownSignal(self):
@@ -170,7 +170,7 @@ class CamtrawlController(QtCore.QObject):
         '''
         msg = "setPCState,254\n"
         self.txSerialData.emit(self.deviceParams['deviceName'], msg)
-        self.logger.debug("CamtrawlController sent: " + msg)
+        self.logger.debug("CamtrawlController sent: %s", msg)
 
 
     def sendShutdownAckSignal(self):
@@ -179,7 +179,7 @@ class CamtrawlController(QtCore.QObject):
         '''
         msg = "setPCState,0\n"
         self.txSerialData.emit(self.deviceParams['deviceName'], msg)
-        self.logger.debug("CamtrawlController sent: " + msg)
+        self.logger.debug("CamtrawlController sent: %s", msg)
 
 
     def getSystemState(self):
@@ -188,7 +188,7 @@ class CamtrawlController(QtCore.QObject):
 
         msg = "getState\n"
         self.txSerialData.emit(self.deviceParams['deviceName'], msg)
-        self.logger.debug("CamtrawlController sent: " + msg)
+        self.logger.debug("CamtrawlController sent: %s", msg)
 
 
     def setSystemState(self, state):
@@ -196,7 +196,7 @@ class CamtrawlController(QtCore.QObject):
         '''
         msg = "setState," + str(state) + "\n"
         self.txSerialData.emit(self.deviceParams['deviceName'], msg)
-        self.logger.debug("CamtrawlController sent: " + msg)
+        self.logger.debug("CamtrawlController sent: %s", msg)
 
 
     def getStrobeMode(self):
@@ -204,7 +204,7 @@ class CamtrawlController(QtCore.QObject):
         '''
         msg = "getStrobeMode\n"
         self.txSerialData.emit(self.deviceParams['deviceName'], msg)
-        self.logger.debug("CamtrawlController sent: " + msg)
+        self.logger.debug("CamtrawlController sent: %s", msg)
 
 
     def setStrobeMode(self, mode):
@@ -212,7 +212,7 @@ class CamtrawlController(QtCore.QObject):
         '''
         msg = "setStrobeMode," + str(mode) + "\n"
         self.txSerialData.emit(self.deviceParams['deviceName'], msg)
-        self.logger.debug("CamtrawlController sent: " + msg)
+        self.logger.debug("CamtrawlController sent: %s", msg)
 
 
     def setRTCParameters(self, installed, startDelay):
@@ -224,21 +224,21 @@ class CamtrawlController(QtCore.QObject):
 
         msg = "setRTCPar," + str(installed) + "," + str(startDelay) + "\n"
         self.txSerialData.emit(self.deviceParams['deviceName'], msg)
-        self.logger.debug("CamtrawlController sent: " + msg)
+        self.logger.debug("CamtrawlController sent: %s", msg)
 
 
     def getRTCParameters(self):
 
         msg = "getRTCPar\n"
         self.txSerialData.emit(self.deviceParams['deviceName'], msg)
-        self.logger.debug("CamtrawlController sent: " + msg)
+        self.logger.debug("CamtrawlController sent: %s", msg)
 
 
     def getRTC(self):
 
         msg = "getRTC\n"
         self.txSerialData.emit(self.deviceParams['deviceName'], msg)
-        self.logger.debug("CamtrawlController sent: " + msg)
+        self.logger.debug("CamtrawlController sent: %s", msg)
 
 
     def setRTC(self, time=None):
@@ -252,7 +252,7 @@ class CamtrawlController(QtCore.QObject):
 
         msg = "setRTC," + time.strftime("%Y,%m,%d,%H,%M,%S") + "\n"
         self.txSerialData.emit(self.deviceParams['deviceName'], msg)
-        self.logger.debug("CamtrawlController sent: " + msg)
+        self.logger.debug("CamtrawlController sent: %s", msg)
 
 
     def setP2DParameters(self, enabled, slope, intercept, turnOnDepth, turnOffDepth):
@@ -269,21 +269,21 @@ class CamtrawlController(QtCore.QObject):
                 "," + str(slope) + "," + str(intercept) + "," + str(turnOnDepth) + "," +
                 str(turnOffDepth) + "\n")
         self.txSerialData.emit(self.deviceParams['deviceName'], msg)
-        self.logger.debug("CamtrawlController sent: " + msg)
+        self.logger.debug("CamtrawlController sent: %s", msg)
 
 
     def getP2DParameters(self):
 
         msg = "getP2DParms\n"
         self.txSerialData.emit(self.deviceParams['deviceName'], msg)
-        self.logger.debug("CamtrawlController sent: " + msg)
+        self.logger.debug("CamtrawlController sent: %s", msg)
 
 
     def getStartupVoltage(self):
 
         msg = "getStartupVoltage\n"
         self.txSerialData.emit(self.deviceParams['deviceName'], msg)
-        self.logger.debug("CamtrawlController sent: " + msg)
+        self.logger.debug("CamtrawlController sent: %s", msg)
 
 
     def getShutdownVoltage(self):
@@ -292,7 +292,7 @@ class CamtrawlController(QtCore.QObject):
 
         msg = "getShutdownVoltage\n"
         self.txSerialData.emit(self.deviceParams['deviceName'], msg)
-        self.logger.debug("CamtrawlController sent: " + msg)
+        self.logger.debug("CamtrawlController sent: %s", msg)
 
 
     def trigger(self, strobePreFire, strobe1Exp, strobe2Exp, chanOneTrig, chanTwoTrig):
@@ -341,7 +341,7 @@ class CamtrawlController(QtCore.QObject):
 
         self.txSerialData.emit(self.deviceParams['deviceName'], msg)
 
-        self.logger.debug("CamtrawlController sent: " + msg)
+        self.logger.debug("CamtrawlController sent: %s", msg)
 
 
     def setThrusters(self, thrusterOneVal, thrusterTwoVal):
@@ -380,7 +380,7 @@ class CamtrawlController(QtCore.QObject):
 
         self.txSerialData.emit(self.deviceParams['deviceName'], msg)
 
-        self.logger.debug("CamtrawlController sent: " + msg)
+        self.logger.debug("CamtrawlController sent: %s", msg)
 
 
     @QtCore.pyqtSlot(str, str, object)
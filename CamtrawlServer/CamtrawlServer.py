@@ -183,23 +183,23 @@ class CamtrawlServer(QtCore.QObject):
 
                         #  if the sensor ID is 'None' we return all sensor data
                         if dataRequest.id.lower() == 'none':
-                            for id in self.sensorDataDict:
-                                for header in self.sensorDataDict[id]:
+                            for id, sensor_data in self.sensorDataDict.items():
+                                for header, (time_obj, data) in sensor_data.items():
                                     s = sensorData.sensors.add()
                                     s.id = id
                                     s.header = header
-                                    s.timestamp = self.sensorDataDict[id][header]['time'].timestamp()
-                                    s.data = self.sensorDataDict[id][header]['data']
+                                    s.timestamp = time_obj.timestamp()
+                                    s.data = data
 
                         #  otherwise we only return data from the specified sensor
                         else:
                             if dataRequest.id in self.sensorDataDict:
-                                for header in self.sensorDataDict[dataRequest.id]:
+                                for header, (time_obj, data) in self.sensorDataDict[dataRequest.id].items():
                                     s = sensorData.sensors.add()
                                     s.id = dataRequest.id
                                     s.header = header
-                                    s.timestamp = self.sensorDataDict[dataRequest.id]['time'].timestamp()
-                                    s.data = self.sensorDataDict[dataRequest.id]['data']
+                                    s.timestamp = time_obj.timestamp()
+                                    s.data = data
 
                         #  build the response
                         response = CamtrawlServer_pb2.msg()
@@ -222,8 +222,8 @@ class CamtrawlServer(QtCore.QObject):
 
                             #  emit the sensor data signal
                             self.sensorData.emit(sensor.id, sensor.header, time_obj, sensor.data)
-                            self.logger.debug("setSensorData request received: " + sensor.id + "," +
-                                    sensor.header + "," + sensor.data)
+                            self.logger.debug("setSensorData request received: %s,%s,%s", sensor.id,
+                                    sensor.header, sensor.data)
 
 
                     #  process a get parameter request
@@ -234,7 +234,7 @@ class CamtrawlServer(QtCore.QObject):
 
                         #  and emit the getParameterRequest signal
                         self.getParameterRequest.emit(getParam.module, getParam.parameter)
-                        self.logger.debug("getParameter request received: " + getParam.module + "," + getParam.parameter)
+                        self.logger.debug("getParameter request received: %s,%s", getParam.module, getParam.parameter)
 
                     #  process a set parameter request
                     elif (request.type == CamtrawlServer_pb2.msg.msgType.Value('SETPARAMETER')):
@@ -244,8 +244,8 @@ class CamtrawlServer(QtCore.QObject):
 
                         #  and emit the setParameterRequest signal
                         self.setParameterRequest.emit(setParam.module, setParam.parameter, setParam.value)
-                        self.logger.debug("setParameter request received: " + setParam.module + "," + setParam.parameter
-                                      + "," + setParam.value)
+                        self.logger.debug("setParameter request received: %s,%s,%s", setParam.module,
+                                      setParam.parameter, setParam.value)
 
 
                     #  process a get sensor info request
@@ -402,7 +402,7 @@ class CamtrawlServer(QtCore.QObject):
         self.clients[thisSocket] = {'buffer':bytearray(), 'datagramSize':0,
                 'requestState':requestState}
 
-        self.logger.debug("Client connected from " + sockAddress + ":" + sockPort)
+        self.logger.debug("Client connected from %s:%s", sockAddress, sockPort)
 
 
     @QtCore.pyqtSlot()
@@ -422,10 +422,10 @@ class CamtrawlServer(QtCore.QObject):
         del self.clients[thisSocket]
         thisSocket.deleteLater()
 
-        self.logger.debug("Client disconnected from " + sockAddress + ":" + sockPort)
+        self.logger.debug("Client disconnected from %s:%s", sockAddress, sockPort)
 
 
-    @QtCore.pyqtSlot(str, str, dict)
+    @QtCore.pyqtSlot(str, str, object)
     def newImageAvailable(self, camera_name, label, image_data):
         '''
         The newImageAvailable slot should be connected to your image data source signal.
@@ -491,12 +491,9 @@ class CamtrawlServer(QtCore.QObject):
     @QtCore.pyqtSlot(str, str, datetime.datetime, str)
     def sensorDataAvailable(self, id, header, time_obj, data):
         '''The sensorDataAvailable slot buffers the most recent sensor data by
-        sensor ID and header.
+        sensor ID and header as a (time, data) tuple.
         '''
-        if id not in self.sensorDataDict:
-            self.sensorDataDict[id] = {}
-
-        self.sensorDataDict[id][header] = {'time':time_obj, 'data':data}
+        self.sensorDataDict.setdefault(id, {})[header] = (time_obj, data)
 
 
     @QtCore.pyqtSlot(str, str, str, bool, str)
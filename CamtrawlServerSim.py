@@ -68,7 +68,7 @@ class CamtrawlServerSim(QtCore.QObject):
     exShutdown = QtCore.pyqtSignal()
     parameterChanged = QtCore.pyqtSignal(str, str, str, bool, str)
     stopServer = QtCore.pyqtSignal()
-    newImageAvailable = QtCore.pyqtSignal(str, str, dict)
+    newImageAvailable = QtCore.pyqtSignal(str, str, object)
 
 
     def __init__(self, deploymentDir, localAddress, localPort,
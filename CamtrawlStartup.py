@@ -280,7 +280,8 @@ class CamtrawlStartup(QtCore.QObject):
         #  read the configuration file
         with open(config_file, 'r') as cf_file:
             try:
-                config = yaml.safe_load(cf_file)
+                #  use the libyaml based loader if PyYAML was built with it
+                config = yaml.load(cf_file, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
             except:
                 pass
 
@@ -0,0 +1,98 @@
+# coding=utf-8
+
+#     National Oceanic and Atmospheric Administration (NOAA)
+#     Alaskan Fisheries Science Center (AFSC)
+#     Resource Assessment and Conservation Engineering (RACE)
+#     Midwater Assessment and Conservation Engineering (MACE)
+
+#  THIS SOFTWARE AND ITS DOCUMENTATION ARE CONSIDERED TO BE IN THE PUBLIC DOMAIN
+#  AND THUS ARE AVAILABLE FOR UNRESTRICTED PUBLIC USE. THEY ARE FURNISHED "AS
+#  IS."  THE AUTHORS, THE UNITED STATES GOVERNMENT, ITS INSTRUMENTALITIES,
+#  OFFICERS, EMPLOYEES, AND AGENTS MAKE NO WARRANTY, EXPRESS OR IMPLIED,
+#  AS TO THE USEFULNESS OF THE SOFTWARE AND DOCUMENTATION FOR ANY PURPOSE.
+#  THEY ASSUME NO RESPONSIBILITY (1) FOR THE USE OF THE SOFTWARE AND
+#  DOCUMENTATION; OR (2) TO PROVIDE TECHNICAL SUPPORT TO USERS.
+
+"""
+.. module:: CamtrawlAcquisition.DatabaseWriter
+
+    :synopsis: Class that writes to the metadata database in its own thread.
+
+| Developed by:  Rick Towler   <rick.towler@noaa.gov>
+| National Oceanic and Atmospheric Administration (NOAA)
+| National Marine Fisheries Service (NMFS)
+| Alaska Fisheries Science Center (AFSC)
+| Midwater Assesment and Conservation Engineering Group (MACE)
+|
+| Author:
+|       Rick Towler   <rick.towler@noaa.gov>
+| Maintained by:
+|       Rick Towler   <rick.towler@noaa.gov>
+"""
+
+from PyQt5 import QtCore
+from metadata_db import metadata_db
+
+
+class DatabaseWriter(QtCore.QObject):
+    '''
+    The DatabaseWriter class owns a connection to the metadata database and
+    executes metadata_db write methods on behalf of the application. It is
+    intended to be moved to its own thread so SQLite I/O does not block the
+    application's event loop.
+
+    Writes are requested by connecting a signal to the write slot and emitting
+    the name of the metadata_db method along with a tuple of its arguments.
+    Requests are executed in the order they are received.
+    '''
+
+    #  define PyQt Signals
+    error = QtCore.pyqtSignal(str)
+    writerStopped = QtCore.pyqtSignal()
+
+    #  the name of the writer's database connection. It must differ from the
+    #  connection used by the application thread.
+    CONNECTION_NAME = 'DatabaseWriter'
+
+    def __init__(self, db_file, parent=None):
+
+        super(DatabaseWriter, self).__init__(parent)
+
+        self.db_file = db_file
+        self.db = None
+
+
+    @QtCore.pyqtSlot()
+    def startWriter(self):
+        '''startWriter opens the database connection. This should be called after
+        the writer has been moved to its thread (connect it to the thread's started
+        signal) so the connection is created in that thread.
+        '''
+        self.db = metadata_db(connection_name=self.CONNECTION_NAME)
+        if not self.db.open(self.db_file):
+            self.error.emit('Unable to open database file %s for writing.' % self.db_file)
+
+
+    @QtCore.pyqtSlot(str, object)
+    def write(self, method, args):
+        '''write calls the named metadata_db method with the provided arguments.
+        '''
+        if self.db is None or not self.db.is_open:
+            #  the database failed to open or the writer has been stopped
+            self.error.emit('Database is not open. Dropped %s write.' % method)
+            return
+
+        try:
+            getattr(self.db, method)(*args)
+        except Exception as e:
+            self.error.emit('Error executing %s: %s' % (method, e))
+
+
+    @QtCore.pyqtSlot()
+    def stopWriter(self):
+        '''stopWriter commits any pending writes, closes the database, and emits
+        the writerStopped signal.
+        '''
+        if self.db is not None and self.db.is_open:
+            self.db.close()
+        self.writerStopped.emit()
@@ -0,0 +1,109 @@
+# coding=utf-8
+
+#     National Oceanic and Atmospheric Administration (NOAA)
+#     Alaskan Fisheries Science Center (AFSC)
+#     Resource Assessment and Conservation Engineering (RACE)
+#     Midwater Assessment and Conservation Engineering (MACE)
+
+#  THIS SOFTWARE AND ITS DOCUMENTATION ARE CONSIDERED TO BE IN THE PUBLIC DOMAIN
+#  AND THUS ARE AVAILABLE FOR UNRESTRICTED PUBLIC USE. THEY ARE FURNISHED "AS
+#  IS."  THE AUTHORS, THE UNITED STATES GOVERNMENT, ITS INSTRUMENTALITIES,
+#  OFFICERS, EMPLOYEES, AND AGENTS MAKE NO WARRANTY, EXPRESS OR IMPLIED,
+#  AS TO THE USEFULNESS OF THE SOFTWARE AND DOCUMENTATION FOR ANY PURPOSE.
+#  THEY ASSUME NO RESPONSIBILITY (1) FOR THE USE OF THE SOFTWARE AND
+#  DOCUMENTATION; OR (2) TO PROVIDE TECHNICAL SUPPORT TO USERS.
+
+"""
+.. module:: CamtrawlAcquisition.DiskMonitor
+
+    :synopsis: Class that periodically checks the free space of the
+               data disk in its own thread.
+
+| Developed by:  Rick Towler   <rick.towler@noaa.gov>
+| National Oceanic and Atmospheric Administration (NOAA)
+| National Marine Fisheries Service (NMFS)
+| Alaska Fisheries Science Center (AFSC)
+| Midwater Assesment and Conservation Engineering Group (MACE)
+|
+| Author:
+|       Rick Towler   <rick.towler@noaa.gov>
+| Maintained by:
+|       Rick Towler   <rick.towler@noaa.gov>
+"""
+
+import os
+import shutil
+from PyQt5 import QtCore
+
+
+def disk_free_mb(path):
+    '''disk_free_mb returns the free space available to unprivileged users on the
+    file system containing path in megabytes. os.statvfs is used where available
+    and shutil.disk_usage is used on platforms without it (Windows).
+    '''
+    if hasattr(os, 'statvfs'):
+        stats = os.statvfs(path)
+        return (stats.f_bavail * stats.f_frsize) // 1048576
+    else:
+        return shutil.disk_usage(path).free // 1048576
+
+
+class DiskMonitor(QtCore.QObject):
+    '''
+    The DiskMonitor class periodically checks the free space on the disk
+    containing the specified path and emits the diskFree signal with the
+    free space in MB. It is intended to be moved to its own thread so the
+    file system calls, which can stall on a busy disk, do not block the
+    application's event loop.
+
+    The most recent value is also available as the free_mb attribute.
+    '''
+
+    #  define PyQt Signals
+    diskFree = QtCore.pyqtSignal(int)
+    monitorStopped = QtCore.pyqtSignal()
+
+    def __init__(self, path, interval_ms, parent=None):
+
+        super(DiskMonitor, self).__init__(parent)
+
+        self.path = str(path)
+        self.interval_ms = interval_ms
+        self.free_mb = -1
+        self.checkTimer = None
+
+
+    @QtCore.pyqtSlot()
+    def startMonitoring(self):
+        '''startMonitoring creates the check timer and starts monitoring. This should
+        be called after the monitor has been moved to its thread (connect it to the
+        thread's started signal) so the timer is created in that thread.
+        '''
+        if self.checkTimer is None:
+            self.checkTimer = QtCore.QTimer(self)
+            self.checkTimer.timeout.connect(self.checkDiskFree)
+            self.checkTimer.setSingleShot(False)
+            self.checkTimer.setTimerType(QtCore.Qt.VeryCoarseTimer)
+        self.checkTimer.start(self.interval_ms)
+
+
+    @QtCore.pyqtSlot()
+    def stopMonitoring(self):
+        '''stopMonitoring stops the check timer and emits the monitorStopped signal.
+        '''
+        if self.checkTimer is not None:
+            self.checkTimer.stop()
+        self.monitorStopped.emit()
+
+
+    @QtCore.pyqtSlot()
+    def checkDiskFree(self):
+        '''checkDiskFree gets the disk free space, updates free_mb, and emits
+        the diskFree signal.
+        '''
+        try:
+            self.free_mb = disk_free_mb(self.path)
+        except OSError:
+            #  we'll try again on the next interval
+            return
+        self.diskFree.emit(self.free_mb)
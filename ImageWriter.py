@@ -77,6 +77,7 @@ class ImageWriter(QtCore.QObject):
         self.is_recording = False
         self.ffmpeg_process = None
         self.ffmpeg_out = None
+        self.pipe_yuv420 = False
         self.filename = ''
         self.save_video = False
         self.this_video_start_frame = 0
@@ -94,7 +95,7 @@ class ImageWriter(QtCore.QObject):
                               'scale':100}
 
 
-    @QtCore.pyqtSlot(str, dict)
+    @QtCore.pyqtSlot(str, object)
     def WriteImage(self, camera_name, image_data):
         '''The WriteImage slot writes image data to disk. It
         '''
@@ -194,8 +195,13 @@ class ImageWriter(QtCore.QObject):
 
             #  add this frame
             try:
-                # pass the image data to ffmpeg
-                self.ffmpeg_process.stdin.write(scaled_image.tobytes())
+                #  convert to I420 if the file was opened to accept it
+                if self.pipe_yuv420:
+                    scaled_image = cv2.cvtColor(scaled_image, cv2.COLOR_BGR2YUV_I420)
+
+                # pass the image data to ffmpeg. Write the array's buffer directly
+                # instead of copying the frame into a bytes object first.
+                self.ffmpeg_process.stdin.write(np.ascontiguousarray(scaled_image).data)
 
                 # increase the video frame counter
                 self.frame_number = self.frame_number + 1
@@ -224,8 +230,19 @@ class ImageWriter(QtCore.QObject):
 
         try:
 
+            #  When encoding to yuv420p we convert the frames with OpenCV before piping
+            #  them to ffmpeg. cv2.cvtColor is faster than ffmpeg's swscale conversion
+            #  and I420 frames are half the size of BGR frames. I420 requires even
+            #  frame dimensions so we fall back to piping BGR if they are odd.
+            self.pipe_yuv420 = (self.video_options['pixel_format'] == 'yuv420p' and
+                    width % 2 == 0 and height % 2 == 0)
+            if self.pipe_yuv420:
+                input_format = 'yuv420p'
+            else:
+                input_format = 'bgr24'
+
             #  generate the base ffmpeg command string
-            command_string = (f'ffmpeg -y -s {width}x{height} -pixel_format bgr24 ' +
+            command_string = (f'ffmpeg -y -s {width}x{height} -pixel_format {input_format} ' +
                     f'-f rawvideo -r {self.video_options["framerate"]} -i pipe: -c:v ' +
                     f'{self.video_options["encoder"]}  ')
 
@@ -88,8 +88,10 @@ class SpinCamera(QtCore.QObject):
     SETTINGS_LAG = 2
 
     #  define PyQt Signals
-    imageData = QtCore.pyqtSignal(str, str, dict)
-    saveImage = QtCore.pyqtSignal(str, dict)
+    #  the image data dicts are emitted as object so PyQt passes a reference to the
+    #  dict instead of converting it to and from a QVariantMap on every emit.
+    imageData = QtCore.pyqtSignal(str, str, object)
+    saveImage = QtCore.pyqtSignal(str, object)
     imageSaved = QtCore.pyqtSignal(object, str)
     videoSaved = QtCore.pyqtSignal(str,str, int, int, datetime.datetime, datetime.datetime)
     error = QtCore.pyqtSignal(str, str)
@@ -309,6 +311,16 @@ class SpinCamera(QtCore.QObject):
         return True
 
 
+    @QtCore.pyqtSlot(object)
+    def trigger_event(self, event):
+        '''trigger_event is the single argument form of trigger. event is a sequence of
+        the trigger arguments (cam_list, image_number, timestamp, save_image, emit_signal)
+        such as the TriggerEvent namedtuple emitted by AcquisitionBase. Passing a single
+        object reduces the signal marshalling overhead when triggering.
+        '''
+        self.trigger(*event)
+
+
     @QtCore.pyqtSlot(list, int, datetime.datetime, bool, bool)
     def trigger(self, cam_list, image_number, timestamp, save_image, emit_signal):
         '''trigger sets the camera up for the next trigger event and then either executes
@@ -459,8 +471,8 @@ class SpinCamera(QtCore.QObject):
                 self.save_image.append(False)
 
 
-        self.logger.debug("%s triggered: Image number %d Save image: %s" %
-                (self.camera_name, image_number, save_image))
+        self.logger.debug("%s triggered: Image number %d Save image: %s",
+                self.camera_name, image_number, save_image)
 
         #  trigger the camera if we're using software triggering
         if (self.trigger_mode == PySpin.TriggerSource_Software):
@@ -1037,13 +1049,13 @@ class SpinCamera(QtCore.QObject):
         #  Reset n_triggered
         self.n_triggered = 0
 
-        #  set up the file logging directory - create if needed
-        self.save_path = os.path.normpath(file_path) + os.sep + self.camera_name + os.sep
+        #  set up the file logging directory - create if needed. The path is resolved
+        #  once here and the per image file names are built from it when triggered.
+        self.save_path = os.path.join(os.path.normpath(file_path), self.camera_name, '')
 
         try:
-            if not os.path.exists(self.save_path):
-                os.makedirs(self.save_path)
-        except:
+            os.makedirs(self.save_path, exist_ok=True)
+        except OSError:
             self.error.emit(self.camera_name, 'Unable to create file logging directory: %s' %
                     self.save_path)
             self.acquisitionStarted.emit(self, self.camera_name, False)
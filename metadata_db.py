@@ -8,25 +8,54 @@ from PyQt5 import QtCore, QtSql
 
 class metadata_db(QtCore.QObject):
 
-    def __init__(self, parent=None):
+    #  SQLite pragmas applied when the database is opened. WAL journaling with
+    #  synchronous=NORMAL only syncs the disk on checkpoints instead of on every
+    #  commit which greatly reduces the number of fsyncs when acquiring.
+    PRAGMAS = ['PRAGMA journal_mode=WAL',
+               'PRAGMA synchronous=NORMAL',
+               'PRAGMA temp_store=MEMORY',
+               'PRAGMA mmap_size=268435456']
+
+    #  SQL for the inserts executed while acquiring. These are prepared once when
+    #  the database is opened and reused so they aren't parsed on every insert.
+    INSERT_SQL = {'images': "INSERT INTO images VALUES(?,?,?,?,?,?,?,?,?,?)",
+                  'dropped': "INSERT INTO dropped VALUES(?,?,?)",
+                  'sensor_data': "INSERT INTO sensor_data VALUES(?,?,?,?,?)",
+                  'async_data': "INSERT INTO async_data VALUES(?,?,?,?)",
+                  'videos': "INSERT INTO videos VALUES(?,?,?,?,?,?)"}
+
+    def __init__(self, connection_name=None, parent=None):
 
         super(metadata_db, self).__init__(parent)
 
-        self.db = QtSql.QSqlDatabase.addDatabase("QSQLITE")
+        #  a connection name must be provided when more than one connection is in use
+        if connection_name is None:
+            self.db = QtSql.QSqlDatabase.addDatabase("QSQLITE")
+        else:
+            self.db = QtSql.QSqlDatabase.addDatabase("QSQLITE", connection_name)
+        self.db_file = None
         self.is_open = False
+        self.in_transaction = False
+        self.queries = {}
 
 
     def open(self, db_file):
 
         db_file = os.path.normpath(db_file)
+        self.db_file = db_file
         self.db.setDatabaseName(db_file)
 
         if self.db.open():
+            #  configure the connection
+            for pragma in self.PRAGMAS:
+                QtSql.QSqlQuery(pragma, self.db)
+
             #  check if this is a new or existing database file
             if (not 'cameras' in self.db.tables()):
                 #  we'll assume if the cameras table doesn't exist, then this is a new
                 #  database file. Create the base camtrawl acquisition tables
                 self.create_database()
+            self.prepare_queries()
             self.is_open = True
         else:
             self.is_open = False
@@ -55,20 +84,75 @@ class metadata_db(QtCore.QObject):
         else:
             sql = ("INSERT INTO cameras VALUES('" + name + "','" + device_id + "','" +
                     serial + "','" + label + "','" + rot + "','" + version + "','" + speed + "')")
-        query = QtSql.QSqlQuery(sql, self.db)
+        QtSql.QSqlQuery(sql, self.db)
+
+
+    def prepare_queries(self):
+        '''
+        prepare_queries prepares the insert queries in INSERT_SQL.
+        '''
+
+        self.queries = {}
+        for table, sql in self.INSERT_SQL.items():
+            query = QtSql.QSqlQuery(self.db)
+            query.prepare(sql)
+            self.queries[table] = query
+
+
+    def _exec_insert(self, table, values):
+        '''
+        _exec_insert binds the values to the prepared insert query for the specified
+        table and executes it.
+        '''
+
+        query = self.queries[table]
+        for i, value in enumerate(values):
+            query.bindValue(i, value)
         query.exec_()
 
 
+    def _exec_insert_batch(self, table, columns):
+        '''
+        _exec_insert_batch binds the lists of column values to the prepared insert query
+        for the specified table and executes it once for each row.
+        '''
+
+        query = self.queries[table]
+        for i, column in enumerate(columns):
+            query.bindValue(i, column)
+        query.execBatch()
+
+
     def insert_async_data(self, sensor_id, header, rx_time, data):
         '''
         insert_async_data inserts a row in the async_data table
         '''
 
-        time_str = self.datetime_to_db_str(rx_time)
-        sql = ("INSERT INTO async_data VALUES('" + time_str + "','" + sensor_id + "','" + header +
-                "','" + data + "')" )
-        query = QtSql.QSqlQuery(sql, self.db)
-        query.exec_()
+        self._exec_insert('async_data', (self.datetime_to_db_str(rx_time), sensor_id,
+                header, data))
+
+
+    def insert_async_data_batch(self, rows):
+        '''
+        insert_async_data_batch inserts multiple rows in the async_data table. rows
+        is a list of (sensor_id, header, rx_time, data) tuples. If a transaction is
+        not active, the rows are inserted in their own transaction.
+        '''
+
+        if not rows:
+            return
+
+        own_transaction = not self.in_transaction
+        if own_transaction:
+            self.begin_transaction()
+
+        self._exec_insert_batch('async_data', ([self.datetime_to_db_str(row[2]) for row in rows],
+                [row[0] for row in rows],
+                [row[1] for row in rows],
+                [row[3] for row in rows]))
+
+        if own_transaction:
+            self.commit()
 
 
     def insert_sync_data(self, image_num, rx_time, sensor_id, header, data):
@@ -76,11 +160,25 @@ class metadata_db(QtCore.QObject):
         insert_sync_data inserts a row in the sensor_data table
         '''
 
-        time_str = self.datetime_to_db_str(rx_time)
-        sql = ("INSERT INTO sensor_data VALUES(" + str(image_num) + ",'" + time_str + "','" +
-                sensor_id + "','" + header + "','" + data + "')")
-        query = QtSql.QSqlQuery(sql, self.db)
-        query.exec_()
+        self._exec_insert('sensor_data', (image_num, self.datetime_to_db_str(rx_time),
+                sensor_id, header, data))
+
+
+    def insert_sync_data_batch(self, rows):
+        '''
+        insert_sync_data_batch inserts multiple rows in the sensor_data table. rows
+        is a list of [image_num, rx_time, sensor_id, header, data] lists. The rows are
+        inserted using a single prepared statement.
+        '''
+
+        if not rows:
+            return
+
+        self._exec_insert_batch('sensor_data', ([row[0] for row in rows],
+                [self.datetime_to_db_str(row[1]) for row in rows],
+                [row[2] for row in rows],
+                [row[3] for row in rows],
+                [row[4] for row in rows]))
 
 
     def get_next_image_number(self):
@@ -105,21 +203,17 @@ class metadata_db(QtCore.QObject):
         add_dropped inserts an entry in the dropped images table
         '''
 
-        time_str = self.datetime_to_db_str(trig_time)
-        sql = ("INSERT INTO dropped VALUES(" + str(image_num) + ",'" + cam_name + "','" + time_str + "')")
-        query = QtSql.QSqlQuery(sql, self.db)
-        query.exec_()
+        self._exec_insert('dropped', (image_num, cam_name, self.datetime_to_db_str(trig_time)))
 
 
     def add_image(self, image_num, cam_name, trig_time, image_filename, exposure,
             gain, save_still, save_frame, discarded=None, md5=None):
 
+        #  unset md5 and discarded values are stored as NULL
         if not md5:
-            md5 = 'NULL'
-        else:
-            md5 = "'" + md5 + "'"
+            md5 = None
         if not discarded:
-            discarded = 'NULL'
+            discarded = None
         else:
             discarded = 1
 
@@ -127,12 +221,30 @@ class metadata_db(QtCore.QObject):
         save_still = int(save_still)
         save_frame = int(save_frame)
 
-        time_str = self.datetime_to_db_str(trig_time)
-        sql = ("INSERT INTO images VALUES(" + str(image_num) + ",'" + cam_name + "','" + time_str + "','" +
-                image_filename + "'," + str(exposure) + "," + str(gain) + "," + str(save_still) + ',' +
-                str(save_frame) + ',' + str(discarded) + ',' + md5 + ")")
-        query = QtSql.QSqlQuery(sql, self.db)
-        query.exec_()
+        self._exec_insert('images', (image_num, cam_name, self.datetime_to_db_str(trig_time),
+                image_filename, exposure, gain, save_still, save_frame, discarded, md5))
+
+
+    def add_images(self, rows):
+        '''
+        add_images inserts multiple rows in the images table. rows is a list of
+        (image_num, cam_name, trig_time, image_filename, exposure, gain, save_still,
+        save_frame) tuples. The rows are inserted using a single prepared statement.
+        '''
+
+        if not rows:
+            return
+
+        nulls = [None] * len(rows)
+        self._exec_insert_batch('images', ([row[0] for row in rows],
+                [row[1] for row in rows],
+                [self.datetime_to_db_str(row[2]) for row in rows],
+                [row[3] for row in rows],
+                [row[4] for row in rows],
+                [row[5] for row in rows],
+                [int(row[6]) for row in rows],
+                [int(row[7]) for row in rows],
+                nulls, nulls))
 
 
     def add_video(self, cam_name, file_name, start_frame, end_frame, start_time, end_time):
@@ -143,12 +255,8 @@ class metadata_db(QtCore.QObject):
         video frames.
         '''
 
-        start_time = self.datetime_to_db_str(start_time)
-        end_time = self.datetime_to_db_str(end_time)
-        sql = ("INSERT INTO videos VALUES('" + cam_name + "','" + file_name + "'," + str(start_frame) +
-                "," + str(end_frame) + ",'" + start_time + "','" + end_time + "')")
-        query = QtSql.QSqlQuery(sql, self.db)
-        query.exec_()
+        self._exec_insert('videos', (cam_name, file_name, start_frame, end_frame,
+                self.datetime_to_db_str(start_time), self.datetime_to_db_str(end_time)))
 
 
     def set_deployment_metadata(self, vessel_name, survey_name, camera_name, description, start_time):
@@ -171,8 +279,7 @@ class metadata_db(QtCore.QObject):
         sql = ("INSERT INTO deployment (survey_name,vessel_name,camera_name,survey_description,start_time) " +
                 "VALUES ('" + survey_name + "','" + vessel_name + "','" + camera_name + "','" +
                 description + "','" + time_str + "')")
-        query = QtSql.QSqlQuery(sql, self.db)
-        query.exec_()
+        QtSql.QSqlQuery(sql, self.db)
 
 
     def update_deployment_endtime(self, end_time):
@@ -182,37 +289,60 @@ class metadata_db(QtCore.QObject):
         '''
 
         time_str = self.datetime_to_db_str(end_time)
-        sql = ("UPDATE deployment SET end_time='" + time_str +"')")
+        sql = ("UPDATE deployment SET end_time='" + time_str +"'")
 
-        query = QtSql.QSqlQuery(sql, self.db)
-        query.exec_()
+        QtSql.QSqlQuery(sql, self.db)
 
 
     def set_image_extension(self, extension):
 
         sql = ("INSERT INTO deployment_data (deployment_parameter,parameter_value) " +
                 "VALUES ('image_file_type','" + extension + "')")
-        query = QtSql.QSqlQuery(sql, self.db)
-        query.exec_()
+        QtSql.QSqlQuery(sql, self.db)
 
 
     def set_video_extension(self, extension):
 
         sql = ("INSERT INTO deployment_data (deployment_parameter,parameter_value) " +
                 "VALUES ('video_file_type','" + extension + "')")
-        query = QtSql.QSqlQuery(sql, self.db)
-        query.exec_()
+        QtSql.QSqlQuery(sql, self.db)
 
 
     def datetime_to_db_str(self, dt_obj):
+        '''
+        datetime_to_db_str returns the time as a "YYYY-MM-DD HH:MM:SS.mmm" string.
+        Sub-millisecond values are truncated.
+        '''
+
+        return dt_obj.isoformat(sep=' ', timespec='milliseconds')
+
 
-        dt_string = dt_obj.strftime("%Y-%m-%d %H:%M:%S")
-        dt_string = dt_string + '.%03d' % (round(dt_obj.microsecond / 1000))
+    def begin_transaction(self):
+        '''
+        begin_transaction starts a transaction if one is not already active. Inserts
+        are then grouped until commit is called.
+        '''
+
+        if not self.in_transaction:
+            self.in_transaction = self.db.transaction()
+
+        return self.in_transaction
+
+
+    def commit(self):
+        '''
+        commit commits the active transaction, if any.
+        '''
 
-        return dt_string
+        if self.in_transaction:
+            self.db.commit()
+            self.in_transaction = False
 
 
     def close(self):
+        self.commit()
+        #  release the prepared queries before closing the connection
+        self.queries = {}
         self.db.close()
         self.is_open = False
 
@@ -231,5 +361,4 @@ class metadata_db(QtCore.QObject):
 
         #  execute the sql statements
         for s in sql:
-            query = QtSql.QSqlQuery(s, self.db)
-            query.exec_()
+            QtSql.QSqlQuery(s, self.db)